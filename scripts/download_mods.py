@@ -8,16 +8,21 @@ It organizes downloads by category and provides progress tracking.
 
 import os
 import sys
-import subprocess
 import argparse
+import atexit
+import functools
 import json
+import re
 import time
 import zipfile
 import io
-import requests
 import hashlib
 from pathlib import Path
 import shutil
+import queue
+import threading
+
+import mod_explorer
 
 
 def get_script_dir():
@@ -43,12 +48,189 @@ PROGRESS_FILE = os.path.join(CACHE_DIR, "download_progress.json")
 MC_VERSION = "1.21.5"
 LOADER = "fabric"
 
+# Version patterns found in mod filenames, tried in order
+VERSION_PATTERNS = (
+    re.compile(r'-(\d+\.\d+\.\d+(\.\d+)?)'),        # modname-1.2.3.jar
+    re.compile(r'fabric-(\d+\.\d+\.\d+(\.\d+)?)'),  # modname-fabric-1.2.3.jar
+    re.compile(r'-v(\d+\.\d+\.\d+(\.\d+)?)'),       # modname-v1.2.3.jar
+)
+
+# Base mod name patterns used by get_base_mod_name, tried in order
+BASE_NAME_MOD_FABRIC_RE = re.compile(r'([a-z0-9_-]+)-fabric')    # mod-fabric-version
+BASE_NAME_FABRIC_MOD_RE = re.compile(r'fabric-([a-z0-9_-]+)')    # fabric-mod-version
+BASE_NAME_MOD_VERSION_RE = re.compile(r'([a-z0-9_-]+)-\d')      # mod-version
+
+# Profile entries: "[type] filename" lines; comments and blank lines never match
+PROFILE_LINE_RE = re.compile(r'^[ \t]*\[([^\]\n]*)\][ \t]*(\S[^\n]*?)[ \t\r]*$', re.M)
+
+# Mod searches per category as (label, search term, result limit), in download order
+CATEGORY_SPECS = {
+    "essential-dependencies": [
+        # IMPORTANT: We use a static version of Fabric API (fabric-api-1.21.5.jar)
+        # DO NOT uncomment the following line as it might download an incompatible version
+        # ("Fabric API", "fabric api", 1),
+    ],
+    "performance-mods": [
+        ("Performance Mods", "lithium", 1),
+        ("Performance Mods", "ferrite", 1),
+        ("Performance Mods", "starlight", 1),
+        ("Performance Mods", "entityculling", 1),
+        ("Performance Mods", "memo", 1),
+        ("Performance Mods", "lazyDFU", 1),
+        ("Performance Mods", "immediatelyfast", 1),
+    ],
+    "adventure-mods": [
+        ("Adventure Mods", "adventure", 5),
+    ],
+    "high-quality-mods": [
+        ("Better Combat", "bettercombat", 1),
+        ("Better Villages", "villager", 3),
+        # Skip magic-bundle as it requires client-side dependencies
+        # ("Magic Mods", "magic", 3),
+        ("Grind Mods", "grind", 2),
+        ("RPG", "rpg", 3),
+        # NOTE: RPG Stash will be filtered out in cleanup step due to missing dependency 'lithostitched'
+    ],
+    "world-generation-mods": [
+        ("World Generation", "terrain", 3),
+        ("World Generation", "biome", 3),
+        # NOTE: Biome Replacer will be filtered out in cleanup step due to incompatibility with Minecraft 1.21.5
+        ("World Generation", "structure", 3),
+        ("World Generation", "exploration", 3),
+    ],
+    "dungeon-exploration-mods": [
+        ("Dungeons", "dungeon", 5),
+        # NOTE: DungeonDodge+ will be filtered out in cleanup step due to client-side compatibility issues
+        ("Exploration", "exploration", 5),
+        ("Ruins", "ruins", 3),
+        # NOTE: Philip's Ruins will be filtered out in cleanup step due to incompatibility with Minecraft 1.21.5
+    ],
+    "quest-mods": [
+        ("Quest Mods", "quest", 3),
+        ("Quest Mods", "mission", 2),
+    ],
+    "boss-combat-mods": [
+        ("Boss Mods", "boss", 3),
+        # Skip combat-control as it requires client-side dependencies
+        # ("Combat Mods", "combat", 3),
+        ("Combat Mods", "weapon", 3),
+        # NOTE: More Weapon Variants will be filtered out in cleanup step due to missing dependency 'mstv-base'
+    ],
+    "animal-creature-mods": [
+        ("Animals", "animals", 3),
+        ("Mobs", "creature", 3),
+        ("Mobs", "monster", 3),
+    ],
+    "item-equipment-mods": [
+        ("Items", "item", 3),
+        ("Equipment", "equipment", 3),
+        # NOTE: Take's Armory will be filtered out in cleanup step due to missing dependency 'tlib'
+        ("Tools", "tools", 3),
+        # NOTE: More Tools and Armor will be filtered out in cleanup step due to missing dependency 'modmenu'
+    ],
+    "qol-mods": [
+        # Comment out this client-side mod that's causing issues
+        # ("QoL", "inventory", 2),
+        ("QoL", "crafting", 2),
+        ("QoL", "minimap", 1),
+        ("QoL", "map", 2),
+    ],
+    "furniture-decoration-mods": [
+        ("Furniture", "furniture", 5),
+        # Comment out Better Chroma Key which is client-side
+        # ("Decoration", "decoration", 5),
+        ("Decoration", "decoration", 5),
+        ("Polymer", "polymer", 2),
+        ("Furniture Kits", "kits", 3),
+        ("Chairs", "chairs", 2),
+        ("Tables", "tables", 2),
+    ],
+    "required-dependencies": [
+        ("Dependencies", "collective", 1),
+        ("Dependencies", "cloth-config fabric", 1),
+        ("Dependencies", "extended_drawers", 1),
+        ("Dependencies", "quad", 1),
+    ],
+}
+
+# Category names in download order
+CATEGORY_ORDER = tuple(CATEGORY_SPECS)
+
+# Filename fragments of mods known to be incompatible with the server
+INCOMPATIBLE_PATTERNS = (
+    # Client-side rendering/UI mods that cause server issues
+    "Axiom", "axiom", "dungeondodgeplus", "tweakermore", "mutantmonsters", "MutantMonsters",
+    
+    # Client-side functionality mods that should only be on client
+    "flashside", "visible-entities", "visible", "modelfix", "Gamma-Utils", "gamma",
+    "lambdynamiclights", "dynamic-lights", "Zoomify", "zoom", "f3teverywhere", "f3",
+    "BetterF3", "morechathistory", "chat_heads", "chat-heads", "iris", "sodium",
+    "reeses-sodium", "sodium-extra", "skinlayers3d", "skinlayers", "notenoughanimations",
+    "capes", "entity_model_features", "entity_texture_features", "xaerominimap", "Xaeros",
+    "minecartsloadchunks",
+    
+    # Known problematic mods that cause server crashes or issues
+    "dungeons-and-taverns", "adventuremodetweaks", "attributerpgfied", "nemos-carpentry",
+    "structurevoidable", "structure_void_toggle", "structure_void", "mutantmonsters", "MutantMonsters", 
+    "monsters_in_the_closet", "monsters-in-the-closet", "c2me-opts-natives-math",
+    
+    # Mods with missing dependencies or compatibility issues
+    "biomereplacer", "rpg-stash", "takesarmory", "combat-control", 
+    "more_tools_and_armor", "mstv-", "dcqinv", "monsters_in_the_closet", 
+    "combatamenities", "betterchromakey", "inventoryprofilesnext", "magic-bundle"
+)
+
+# All incompatible patterns as one alternation so each filename is scanned once
+INCOMPATIBLE_RE = re.compile('|'.join(re.escape(pattern) for pattern in INCOMPATIBLE_PATTERNS))
+
+# Progress changes are batched and written at most this often (seconds), see mark_progress_dirty
+PROGRESS_FLUSH_INTERVAL = 5
+PROGRESS_DIRTY = False
+PROGRESS_PENDING = None
+PROGRESS_LAST_FLUSH = 0.0
+
+# Number of local hash/link/copy jobs to run at the same time; downloads use
+# mod_explorer.DOWNLOAD_WORKERS, which --concurrency sets for both scripts
+FILE_WORKERS = os.cpu_count() or 4
+
+# Shared HTTP session so mod downloads reuse keep-alive connections to the CDN
+# instead of paying a new TCP + TLS handshake for every file; it is the same
+# session mod_explorer downloads through, so both share one connection pool
+HTTP_SESSION = mod_explorer.DOWNLOAD_SESSION
+
 
 def ensure_directories():
     """Ensure all required directories exist"""
     os.makedirs(MODS_DIR, exist_ok=True)
     os.makedirs(CACHE_DIR, exist_ok=True)
     os.makedirs(MODPACK_DIR, exist_ok=True)
+    
+    # Remove the mrpack metadata database earlier versions kept in the cache
+    for suffix in ("", "-wal", "-shm"):
+        legacy_path = os.path.join(CACHE_DIR, "mod_index.sqlite" + suffix)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+    
+    # mod_explorer runs in-process and shares our cache
+    mod_explorer.set_cache_dir(CACHE_DIR)
+
+
+# Cached set of the filenames in MODS_DIR, see mods_snapshot()
+MODS_SNAPSHOT = None
+
+
+def mods_snapshot(refresh=False):
+    """
+    Get the filenames in MODS_DIR as a frozenset.
+    
+    The directory is scanned once and reused until refresh=True is passed, which
+    callers do after they (or a download) added, removed or renamed files.
+    """
+    global MODS_SNAPSHOT
+    if MODS_SNAPSHOT is None or refresh:
+        with os.scandir(MODS_DIR) as entries:
+            MODS_SNAPSHOT = frozenset(entry.name for entry in entries)
+    return MODS_SNAPSHOT
 
 
 def load_progress():
@@ -62,125 +244,169 @@ def load_progress():
     return {"categories": {}}
 
 
+def write_file_atomic(path, write):
+    """
+    Replace path with the content produced by write(f), all or nothing.
+    
+    The content goes to a temporary file next to path, is flushed to disk and then
+    swapped in with os.replace, so a crash mid-write never leaves a truncated file.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', buffering=1 << 16) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def save_progress(progress):
     """Save download progress to file"""
-    with open(PROGRESS_FILE, 'w') as f:
-        json.dump(progress, f, indent=2)
+    global PROGRESS_DIRTY, PROGRESS_LAST_FLUSH
+    
+    write_file_atomic(PROGRESS_FILE, lambda f: json.dump(progress, f, separators=(',', ':')))
+    
+    PROGRESS_DIRTY = False
+    PROGRESS_LAST_FLUSH = time.time()
 
 
-def clean_mods_directory():
-    """Clean existing mods directory, preserving Fabric API"""
-    print("Cleaning existing mods directory...")
+def mark_progress_dirty(progress):
+    """
+    Record that progress changed, writing it out at most every PROGRESS_FLUSH_INTERVAL seconds.
     
-    # Preserve Fabric API
-    fabric_api_path = os.path.join(MODS_DIR, "fabric-api-1.21.5.jar")
-    fabric_api_backup = None
+    Whatever is still unsaved gets written by flush_progress, which runs at exit
+    (including after Ctrl+C), so a run rewrites the progress file a handful of
+    times instead of once per category and mrpack.
+    """
+    global PROGRESS_DIRTY, PROGRESS_PENDING
     
-    if os.path.exists(fabric_api_path):
-        print("Preserving Fabric API...")
-        fabric_api_backup = "/tmp/fabric-api-1.21.5.jar"
-        shutil.copy2(fabric_api_path, fabric_api_backup)
+    # Never drop unsaved changes held in a different progress dict
+    if PROGRESS_DIRTY and PROGRESS_PENDING is not progress:
+        save_progress(PROGRESS_PENDING)
     
-    # Remove all .jar files
-    for item in os.listdir(MODS_DIR):
-        if item.endswith('.jar'):
-            os.remove(os.path.join(MODS_DIR, item))
+    PROGRESS_DIRTY = True
+    PROGRESS_PENDING = progress
     
-    # Restore Fabric API if backed up
-    if fabric_api_backup and os.path.exists(fabric_api_backup):
-        print("Restoring Fabric API...")
-        shutil.copy2(fabric_api_backup, fabric_api_path)
-        os.remove(fabric_api_backup)
+    if time.time() - PROGRESS_LAST_FLUSH > PROGRESS_FLUSH_INTERVAL:
+        save_progress(progress)
 
 
-def download_mod(category, search_term, limit=1, force_download=False):
-    """Download a specific mod category"""
-    print(f"Downloading {category} mods...")
+def flush_progress():
+    """Write any progress changes that mark_progress_dirty has not saved yet"""
+    if PROGRESS_DIRTY:
+        save_progress(PROGRESS_PENDING)
+
+
+atexit.register(flush_progress)
+
+
+def clean_mods_directory():
+    """Clean existing mods directory, preserving Fabric API"""
+    print("Cleaning existing mods directory...")
     
-    # Build command arguments
-    cmd = [
-        "python3", 
-        os.path.join(SCRIPT_DIR, "mod_explorer.py"),
-        "--source", "modrinth",
-        "--mc-version", MC_VERSION,
-        "--loader", LOADER,
-        "--search", search_term,
-        "--limit", str(limit),
-        "--download",
-        "--output", MODS_DIR,
-        "--cache-dir", CACHE_DIR
-    ]
+    # Remove all .jar files except Fabric API, which is left in place
+    preserve = {"fabric-api-1.21.5.jar"}
+    with os.scandir(MODS_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith('.jar') and entry.name not in preserve:
+                os.unlink(entry.path)
+            elif entry.name in preserve:
+                print("Preserving Fabric API...")
+    
+    mods_snapshot(refresh=True)
+
+
+def download_mod(category, search_term, limit=1, force_download=False, process_mrpacks=True):
+    """
+    Download a specific mod category
     
-    if force_download:
-        cmd.append("--force-download")
+    Set process_mrpacks to False when several downloads run concurrently; the caller
+    is then responsible for extracting any downloaded .mrpack files afterwards.
+    """
+    print(f"Downloading {category} mods...")
     
     # Get list of mods before download
-    mods_before = set(os.listdir(MODS_DIR))
+    mods_before = mods_snapshot(refresh=True) if process_mrpacks else None
     
-    # Run the command
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print("Successfully downloaded mod(s)!")
-        
-        # Check for newly downloaded .mrpack files and extract them immediately
-        mods_after = set(os.listdir(MODS_DIR))
-        new_files = mods_after - mods_before
-        
-        new_mrpack_files = [f for f in new_files if f.endswith('.mrpack')]
-        if new_mrpack_files:
-            print(f"Found {len(new_mrpack_files)} new .mrpack files, extracting them now...")
-            for mrpack_file in new_mrpack_files:
-                extract_mrpack(os.path.join(MODS_DIR, mrpack_file), MODS_DIR)
-        
-        return True
-    except subprocess.CalledProcessError as e:
+        success = mod_explorer.search_and_download(
+            search_term,
+            source="modrinth",
+            mc_version=MC_VERSION,
+            loader=LOADER,
+            limit=limit,
+            output_dir=MODS_DIR,
+            force_download=force_download,
+            # A forced run also searches again instead of reusing cached results
+            use_cache=not force_download
+        )
+    except Exception as e:
         print(f"Failed to download mod(s): {e}")
-        print(f"Error output: {e.stderr}")
         return False
+    
+    if not success:
+        print(f"Failed to download {category} mod(s)")
+        return False
+    
+    print("Successfully downloaded mod(s)!")
+    
+    if not process_mrpacks:
+        return True
+    
+    # Check for newly downloaded .mrpack files and extract them immediately
+    mods_after = mods_snapshot(refresh=True)
+    new_files = mods_after - mods_before
+    
+    new_mrpack_files = [f for f in new_files if f.endswith('.mrpack')]
+    if new_mrpack_files:
+        print(f"Found {len(new_mrpack_files)} new .mrpack files, extracting them now...")
+        for mrpack_file in new_mrpack_files:
+            extract_mrpack(os.path.join(MODS_DIR, mrpack_file), MODS_DIR)
+    
+    return True
 
 
 def download_specific_mod(category, mod_id, source="modrinth", force_download=False):
     """Download a specific mod by ID"""
     print(f"Downloading {category} mod...")
     
-    # Build command arguments
-    cmd = [
-        "python3", 
-        os.path.join(SCRIPT_DIR, "mod_explorer.py"),
-        "--download-id", mod_id,
-        "--download-source", source,
-        "--mc-version", MC_VERSION,
-        "--loader", LOADER,
-        "--output", MODS_DIR,
-        "--cache-dir", CACHE_DIR
-    ]
-    
-    if force_download:
-        cmd.append("--force-download")
-    
     # Get list of mods before download
-    mods_before = set(os.listdir(MODS_DIR))
+    mods_before = mods_snapshot(refresh=True)
     
-    # Run the command
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print("Successfully downloaded mod!")
-        
-        # Check for newly downloaded .mrpack files and extract them immediately
-        mods_after = set(os.listdir(MODS_DIR))
-        new_files = mods_after - mods_before
-        
-        new_mrpack_files = [f for f in new_files if f.endswith('.mrpack')]
-        if new_mrpack_files:
-            print(f"Found {len(new_mrpack_files)} new .mrpack files, extracting them now...")
-            for mrpack_file in new_mrpack_files:
-                extract_mrpack(os.path.join(MODS_DIR, mrpack_file), MODS_DIR)
-        
-        return True
-    except subprocess.CalledProcessError as e:
+        success = mod_explorer.download_mod(
+            mod_id,
+            source,
+            MC_VERSION,
+            LOADER,
+            MODS_DIR,
+            force_download=force_download
+        )
+    except Exception as e:
         print(f"Failed to download mod: {e}")
-        print(f"Error output: {e.stderr}")
         return False
+    
+    if not success:
+        print(f"Failed to download mod {mod_id}")
+        return False
+    
+    print("Successfully downloaded mod!")
+    
+    # Check for newly downloaded .mrpack files and extract them immediately
+    mods_after = mods_snapshot(refresh=True)
+    new_files = mods_after - mods_before
+    
+    new_mrpack_files = [f for f in new_files if f.endswith('.mrpack')]
+    if new_mrpack_files:
+        print(f"Found {len(new_mrpack_files)} new .mrpack files, extracting them now...")
+        for mrpack_file in new_mrpack_files:
+            extract_mrpack(os.path.join(MODS_DIR, mrpack_file), MODS_DIR)
+    
+    return True
 
 
 def should_replace_mod(filename, existing_file_path):
@@ -194,83 +420,56 @@ def should_replace_mod(filename, existing_file_path):
     if not os.path.exists(existing_file_path):
         return True
     
-    # Handle specific mods with version numbers in the filename
-    try:
-        # Most fabric mods follow the pattern modname-x.y.z+mc1.xx.x-fabric.jar
-        # Extract the version from the filename
-        existing_version = extract_version_from_filename(os.path.basename(existing_file_path))
-        new_version = extract_version_from_filename(filename)
-        
-        # If we successfully extracted versions, compare them
-        if existing_version and new_version:
-            # Default to not replacing if versions can't be clearly compared
-            if existing_version == new_version:
-                return False  # Same version, don't replace
-            
-            # Try to compare version numbers
-            try:
-                # Split version into parts
-                existing_parts = existing_version.split('.')
-                new_parts = new_version.split('.')
-                
-                # Compare parts (if 1.2.3 vs 1.3.0, 1.3.0 is newer)
-                for i in range(min(len(existing_parts), len(new_parts))):
-                    try:
-                        existing_num = int(existing_parts[i])
-                        new_num = int(new_parts[i])
-                        
-                        if new_num > existing_num:
-                            return True  # New version is higher
-                        elif new_num < existing_num:
-                            return False  # Existing version is higher
-                    except ValueError:
-                        # Not numeric parts, can't compare directly
-                        pass
-                        
-                # If all checked parts are equal but one has more parts, longer is usually newer
-                if len(new_parts) > len(existing_parts):
-                    return True
-            except Exception:
-                # If comparison fails, be conservative
-                return False
-    except Exception:
-        # If we can't parse the version, don't replace
+    # Most fabric mods follow the pattern modname-x.y.z+mc1.xx.x-fabric.jar
+    # Extract the version from the filename
+    existing_version = extract_version_from_filename(os.path.basename(existing_file_path))
+    new_version = extract_version_from_filename(filename)
+    
+    # If we can't extract both versions, don't replace
+    if not existing_version or not new_version:
         return False
     
-    # Default: don't replace if we can't determine
-    return False
+    # Replace only when the new version is strictly higher (1.3.0 beats 1.2.3, 1.2.3.1 beats 1.2.3)
+    return parse_version(new_version) > parse_version(existing_version)
 
 
+@functools.lru_cache(maxsize=None)
 def extract_version_from_filename(filename):
     """Extract version string from the filename."""
     # Try to extract version using common patterns
-    import re
-    
-    # Pattern 1: modname-1.2.3.jar
-    match = re.search(r'-(\d+\.\d+\.\d+(\.\d+)?)', filename)
-    if match:
-        return match.group(1)
-    
-    # Pattern 2: modname-fabric-1.2.3.jar
-    match = re.search(r'fabric-(\d+\.\d+\.\d+(\.\d+)?)', filename)
-    if match:
-        return match.group(1)
-    
-    # Pattern 3: modname-v1.2.3.jar
-    match = re.search(r'-v(\d+\.\d+\.\d+(\.\d+)?)', filename)
-    if match:
-        return match.group(1)
+    for pattern in VERSION_PATTERNS:
+        match = pattern.search(filename)
+        if match:
+            return match.group(1)
     
     # No version pattern found
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def parse_version(version):
+    """
+    Parse a dotted version string into a tuple of integers for comparison.
+    
+    VERSION_PATTERNS only capture numeric release segments, so comparing the tuples
+    orders versions the same way PEP 440 orders release numbers (1.10 > 1.9).
+    """
+    return tuple(int(part) if part.isdigit() else 0 for part in version.split('.'))
+
+
+def version_sort_key(filename):
+    """Sort key that orders mod files of the same mod from oldest to newest version"""
+    version = extract_version_from_filename(filename) or '0'
+    # Fall back to the filename itself to break ties between identical versions
+    return parse_version(version), filename
+
+
 def fix_biome_spreader():
     """Fix for biome-spreader issue"""
     print("Checking for biome-spreader mod filename issues...")
     
     # First check for spaces in BiomeSpreader filenames
-    for filename in os.listdir(MODS_DIR):
+    for filename in mods_snapshot():
         if ("biome-spreader" in filename.lower() or "biomespreader" in filename.lower()) and " " in filename and filename.endswith(".jar"):
             biome_spreader_file = os.path.join(MODS_DIR, filename)
             biome_spreader_correct_name = biome_spreader_file.replace(" ", "-")
@@ -280,7 +479,7 @@ def fix_biome_spreader():
                 os.rename(biome_spreader_file, biome_spreader_correct_name)
     
     # Check if BiomeSpreader is using the correct filename format
-    for filename in os.listdir(MODS_DIR):
+    for filename in mods_snapshot(refresh=True):
         if "BiomeSpreader-1.5.0+mc1.21.5.jar" in filename:
             # Create a symbolic link with the exact name the mod is looking for
             src = os.path.join(MODS_DIR, filename)
@@ -288,6 +487,8 @@ def fix_biome_spreader():
             if not os.path.exists(dest):
                 print(f"Creating a copy from {filename} to 'BiomeSpreader-1.5.0 mc1.21.5.jar'")
                 shutil.copy2(src, dest)
+    
+    mods_snapshot(refresh=True)
 
 
 def cleanup_mods():
@@ -295,7 +496,7 @@ def cleanup_mods():
     print("Cleaning up duplicate mods...")
     
     # Remove files with parentheses in the name (duplicates)
-    for filename in os.listdir(MODS_DIR):
+    for filename in mods_snapshot():
         if '(' in filename and ')' in filename and filename.endswith('.jar'):
             os.remove(os.path.join(MODS_DIR, filename))
     
@@ -303,7 +504,7 @@ def cleanup_mods():
     mod_versions = {}
     
     # Identify duplicates by base name
-    for filename in os.listdir(MODS_DIR):
+    for filename in mods_snapshot(refresh=True):
         if not filename.endswith('.jar'):
             continue
             
@@ -324,15 +525,8 @@ def cleanup_mods():
             
         print(f"Found {len(versions)} versions of {base_name}: {', '.join(versions)}")
         
-        # Sort versions by filename (approximate, but usually works)
-        sorted_versions = sorted(versions, key=lambda x: x)
-        newest_version = sorted_versions[-1]
-        
-        # Try to find the newest version by checking the version numbers
-        for version in versions:
-            for other_version in versions:
-                if version != other_version and should_replace_mod(version, os.path.join(MODS_DIR, other_version)):
-                    newest_version = version
+        # Pick the newest version by comparing version numbers in a single pass
+        newest_version = max(versions, key=version_sort_key)
         
         print(f"  Keeping newest version: {newest_version}")
         
@@ -345,35 +539,14 @@ def cleanup_mods():
                     os.remove(file_path)
     
     print("Filtering out known incompatible mods for the server...")
-    incompatible_patterns = [
-        # Client-side rendering/UI mods that cause server issues
-        "Axiom", "axiom", "dungeondodgeplus", "tweakermore", "mutantmonsters", "MutantMonsters",
-        
-        # Client-side functionality mods that should only be on client
-        "flashside", "visible-entities", "visible", "modelfix", "Gamma-Utils", "gamma",
-        "lambdynamiclights", "dynamic-lights", "Zoomify", "zoom", "f3teverywhere", "f3",
-        "BetterF3", "morechathistory", "chat_heads", "chat-heads", "iris", "sodium",
-        "reeses-sodium", "sodium-extra", "skinlayers3d", "skinlayers", "notenoughanimations",
-        "capes", "entity_model_features", "entity_texture_features", "xaerominimap", "Xaeros",
-        "minecartsloadchunks",
-        
-        # Known problematic mods that cause server crashes or issues
-        "dungeons-and-taverns", "adventuremodetweaks", "attributerpgfied", "nemos-carpentry",
-        "structurevoidable", "structure_void_toggle", "structure_void", "mutantmonsters", "MutantMonsters", 
-        "monsters_in_the_closet", "monsters-in-the-closet", "c2me-opts-natives-math",
-        
-        # Mods with missing dependencies or compatibility issues
-        "biomereplacer", "rpg-stash", "takesarmory", "combat-control", 
-        "more_tools_and_armor", "mstv-", "dcqinv", "monsters_in_the_closet", 
-        "combatamenities", "betterchromakey", "inventoryprofilesnext", "magic-bundle"
-    ]
     
-    for pattern in incompatible_patterns:
-        for filename in os.listdir(MODS_DIR):
-            if pattern in filename and filename.endswith('.jar'):
-                file_path = os.path.join(MODS_DIR, filename)
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+    # Check each file once against all patterns
+    with os.scandir(MODS_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith('.jar') and INCOMPATIBLE_RE.search(entry.name):
+                os.unlink(entry.path)
+    
+    mods_snapshot(refresh=True)
 
 
 def get_base_mod_name(filename):
@@ -384,25 +557,23 @@ def get_base_mod_name(filename):
     - lithium-fabric-0.16.2+mc1.21.5.jar -> lithium
     - sodium-fabric-0.6.12+mc1.21.5.jar -> sodium
     """
-    import re
-    
     # Remove .jar extension
     name = filename.lower().replace('.jar', '')
     
     # Try common patterns
     
     # Pattern: mod-fabric-version
-    match = re.match(r'([a-z0-9_-]+)-fabric', name)
+    match = BASE_NAME_MOD_FABRIC_RE.match(name)
     if match:
         return match.group(1)
     
     # Pattern: fabric-mod-version
-    match = re.match(r'fabric-([a-z0-9_-]+)', name)
+    match = BASE_NAME_FABRIC_MOD_RE.match(name)
     if match:
         return f"fabric-{match.group(1)}"
     
     # Pattern: mod-version
-    match = re.match(r'([a-z0-9_-]+)-\d', name)
+    match = BASE_NAME_MOD_VERSION_RE.match(name)
     if match:
         return match.group(1)
     
@@ -415,6 +586,34 @@ def get_base_mod_name(filename):
     return None
 
 
+def read_profile(profile_path):
+    """
+    Get the text of a modpack profile.
+    
+    The text is cached by modification time, so printing, downloading and building the
+    client pack in one run share a single read of the file.
+    """
+    return _read_profile(profile_path, os.stat(profile_path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_profile(profile_path, mtime_ns):
+    """Read a profile; mtime_ns is only part of the cache key"""
+    with open(profile_path, 'r') as f:
+        return f.read()
+
+
+def parse_profile(profile_path):
+    """Parse a modpack profile into a tuple of (mod_type, mod_file) pairs"""
+    return _parse_profile(read_profile(profile_path))
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_profile(data):
+    """Parse profile text; cached so an unchanged profile is only parsed once"""
+    return tuple((mod_type.strip(), mod_file) for mod_type, mod_file in PROFILE_LINE_RE.findall(data))
+
+
 def save_mod_list():
     """Save installed mod list to profile"""
     adventure_pack_file = os.path.join(MODPACK_DIR, "adventure_pack.txt")
@@ -425,53 +624,218 @@ def save_mod_list():
         return
     
     # If it doesn't exist, create a new one
-    with open(adventure_pack_file, 'w') as f:
-        f.write("# Adventure Minecraft - Adventure Pack 1.21.5\n")
-        f.write("# This file contains a list of mods for the Adventure Minecraft modpack\n")
-        f.write("# \n")
-        f.write("# Mod Categories:\n")
-        f.write("# [server] - Server-side only mods\n")
-        f.write("# [client] - Client-side only mods\n")
-        f.write("# [shared] - Mods needed on both server and client\n\n")
+    lines = [
+        "# Adventure Minecraft - Adventure Pack 1.21.5\n",
+        "# This file contains a list of mods for the Adventure Minecraft modpack\n",
+        "# \n",
+        "# Mod Categories:\n",
+        "# [server] - Server-side only mods\n",
+        "# [client] - Client-side only mods\n",
+        "# [shared] - Mods needed on both server and client\n\n",
+        "# --- Mods ---\n",
+    ]
+    for filename in sorted(mods_snapshot()):
+        # Include both .jar files and .mrpack files in the profile
+        if filename.endswith('.jar') or filename.endswith('.mrpack'):
+            lines.append(f"[shared] {filename}\n")
+    
+    write_file_atomic(adventure_pack_file, lambda f: f.writelines(lines))
+
+
+def cache_file_stamp(st):
+    """The size and modification time recorded for a cached file, to notice when it is replaced"""
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def load_cache_index(progress, rebuild=False):
+    """
+    Get the filename -> {"sha1", "size", "mtime_ns"} index of the files in the cache.
+    
+    The index is kept in the progress file and updated as files enter the cache. Cached
+    files are stat'ed from a single directory scan; only those that are not indexed yet,
+    or whose size or modification time changed since they were hashed (e.g. replaced by
+    a forced re-download), get hashed again. Entries whose file has disappeared are
+    dropped. With rebuild=True every cached file is hashed again from scratch.
+    """
+    cache_index = progress.setdefault("cache_index", {})
+    with os.scandir(CACHE_DIR) as entries:
+        cached_files = {
+            entry.name: cache_file_stamp(entry.stat())
+            for entry in entries if entry.name.endswith(('.jar', '.mrpack')) and entry.is_file()
+        }
+    changed = False
+    
+    for filename, entry in list(cache_index.items()):
+        # Entries from older progress files were keyed by SHA1, or had no modification time
+        if rebuild or not isinstance(entry, dict) or "sha1" not in entry or \
+           cached_files.get(filename) != {"size": entry.get("size"), "mtime_ns": entry.get("mtime_ns")}:
+            del cache_index[filename]
+            changed = True
+    
+    new_files = sorted(set(cached_files) - set(cache_index))
+    new_paths = [(os.path.join(CACHE_DIR, filename),) for filename in new_files]
+    for filename, sha1 in zip(new_files, mod_explorer.map_concurrently(mod_explorer.file_sha1, new_paths, FILE_WORKERS)):
+        cache_index[filename] = dict(cached_files[filename], sha1=sha1)
+        changed = True
+    
+    if changed:
+        mark_progress_dirty(progress)
+    
+    return cache_index
+
+
+def cached_files_by_sha1(cache_index):
+    """Map each SHA1 in the cache index to the name of a cached file with that content"""
+    return {entry["sha1"]: filename for filename, entry in cache_index.items()}
+
+
+def index_cached_file(cache_index, sha1, filename):
+    """Record a file that was just written to the cache, replacing any stale entry for it"""
+    cache_index[filename] = dict(cache_file_stamp(os.stat(os.path.join(CACHE_DIR, filename))), sha1=sha1)
+
+
+def fetch_mod_file(mod_filename, download_urls, dest_path, expected_sha1=None):
+    """
+    Download a mod file to dest_path and save a copy in the cache.
+    
+    Each URL is tried in turn until one succeeds. When expected_sha1 is given the
+    downloaded bytes are verified against it, so a truncated or corrupted download
+    moves on to the next URL instead of being kept. Returns True on success.
+    """
+    # Write beside dest_path and swap it in once verified, so an existing file there
+    # (possibly a hard link to the cache) is never truncated
+    part_path = f"{dest_path}.part"
+    for download_url in download_urls:
+        try:
+            print(f"  Downloading {mod_filename} from {download_url}")
+            sha1 = hashlib.sha1()
+            with HTTP_SESSION.get(download_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                
+                with open(part_path, 'wb', buffering=mod_explorer.DOWNLOAD_CHUNK_SIZE) as out_file:
+                    # Reserve the whole file up front when the size is known
+                    mod_explorer.preallocate(out_file.fileno(), int(response.headers.get('content-length', 0)))
+                    for chunk in response.iter_content(chunk_size=mod_explorer.DOWNLOAD_CHUNK_SIZE):
+                        if chunk:
+                            out_file.write(chunk)
+                            sha1.update(chunk)
+                    out_file.truncate()
+            
+            if expected_sha1 and sha1.hexdigest() != expected_sha1:
+                raise ValueError(f"SHA1 mismatch (expected {expected_sha1}, got {sha1.hexdigest()})")
+            os.replace(part_path, dest_path)
+            
+            # Also save to cache
+            mod_explorer.link_or_copy(dest_path, os.path.join(CACHE_DIR, mod_filename))
+            mod_explorer.mark_cached(mod_filename)
+            
+            return True
+        except Exception as e:
+            print(f"  Error downloading {mod_filename}: {str(e)}")
+            # Don't leave a partial file behind, then continue to next URL if available
+            if os.path.exists(part_path):
+                os.remove(part_path)
+    
+    return False
+
+
+# Parsed mrpack indexes keyed by file identity, see read_mrpack_index()
+MRPACK_INDEX_CACHE = {}
+
+
+def read_mrpack_index(mrpack_file, zipf=None):
+    """
+    Get the parsed modrinth.index.json and the override file names of an .mrpack file.
+    
+    Results are cached by the file's device, inode, size and modification time, so the
+    same pack is parsed once per run even after it has been linked into the cache and is
+    opened again for the client pack. Pass zipf when the archive is already open. The
+    returned index is shared between callers and must not be modified.
+    Raises KeyError when the index is missing and json.JSONDecodeError when it is invalid.
+    """
+    st = os.stat(mrpack_file)
+    key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    
+    if key not in MRPACK_INDEX_CACHE:
+        if zipf is None:
+            with zipfile.ZipFile(mrpack_file, 'r') as own_zipf:
+                return read_mrpack_index(mrpack_file, own_zipf)
         
-        f.write("# --- Mods ---\n")
-        for filename in sorted(os.listdir(MODS_DIR)):
-            # Include both .jar files and .mrpack files in the profile
-            if filename.endswith('.jar') or filename.endswith('.mrpack'):
-                f.write(f"[shared] {filename}\n")
+        index = mod_explorer.json_loads(zipf.read("modrinth.index.json"))
+        override_names = tuple(
+            file_info.filename for file_info in zipf.infolist()
+            if file_info.filename.startswith(("overrides/", "server-overrides/")) and not file_info.is_dir()
+        )
+        MRPACK_INDEX_CACHE[key] = (index, override_names)
+    
+    return MRPACK_INDEX_CACHE[key]
+
+
+def extract_zip_entry(zipf, name, target_path):
+    """Stream one archive entry to target_path without loading it into memory"""
+    # Overrides can land on a mod jar that is a hard link to the cache; replace it instead of truncating it
+    part_path = f"{target_path}.part"
+    try:
+        with zipf.open(name) as source, open(part_path, 'wb', buffering=mod_explorer.DOWNLOAD_CHUNK_SIZE) as target_file:
+            shutil.copyfileobj(source, target_file, 1 << 16)
+        os.replace(part_path, target_path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+
+def extract_overrides(zipf, override_names, override_dirs, target_root):
+    """
+    Extract the mrpack override files under override_dirs into target_root.
+    
+    Later override directories win when they contain the same file. Parent directories
+    are created up front, then the files are written on the file thread pool: ZipFile
+    supports concurrent readers and decompression runs outside its lock.
+    Returns the paths of the files written.
+    """
+    targets = {}
+    for override_dir in override_dirs:
+        prefix = f"{override_dir}/"
+        for override_name in override_names:
+            if override_name.startswith(prefix):
+                targets[os.path.join(target_root, override_name[len(prefix):])] = override_name
+    
+    for target_dir in {os.path.dirname(target_path) for target_path in targets}:
+        os.makedirs(target_dir, exist_ok=True)
+    
+    mod_explorer.map_concurrently(extract_zip_entry, [
+        (zipf, override_name, target_path) for target_path, override_name in targets.items()
+    ], FILE_WORKERS)
+    
+    return list(targets)
 
 
-def extract_mrpack(mrpack_file, extract_dir):
+def extract_mrpack(mrpack_file, extract_dir, progress=None):
     """
     Extract and process an .mrpack file
     
     mrpack files are zip archives containing a modrinth.index.json file and mod files.
     This function extracts the mods and configuration files to the appropriate directories.
+    Mods are looked up in the cache by the SHA1 listed in the index, so a cached copy is
+    reused even under a different filename; the cache index lives in progress.
     """
     print(f"Processing modpack: {os.path.basename(mrpack_file)}")
     
-    # Create a temporary directory for extraction
-    temp_dir = os.path.join(CACHE_DIR, "temp_mrpack_extract")
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-    os.makedirs(temp_dir, exist_ok=True)
+    if progress is None:
+        progress = load_progress()
     
-    # Extract the mrpack file
+    # Read the mrpack file in place
     with zipfile.ZipFile(mrpack_file, 'r') as zipf:
-        # Extract the index file first
+        # Load and parse the index file straight from the archive
         try:
-            zipf.extract("modrinth.index.json", temp_dir)
+            index, override_names = read_mrpack_index(mrpack_file, zipf)
         except KeyError:
             print(f"Error: Invalid mrpack file format - missing modrinth.index.json in {mrpack_file}")
             return False
-        
-        # Load and parse the index file
-        with open(os.path.join(temp_dir, "modrinth.index.json"), 'r') as f:
-            try:
-                index = json.load(f)
-            except json.JSONDecodeError:
-                print(f"Error: Invalid JSON in modrinth.index.json from {mrpack_file}")
-                return False
+        except json.JSONDecodeError:
+            print(f"Error: Invalid JSON in modrinth.index.json from {mrpack_file}")
+            return False
         
         # Verify format version
         if index.get("formatVersion") != 1:
@@ -487,6 +851,10 @@ def extract_mrpack(mrpack_file, extract_dir):
         
         # Process files from the index
         processed_count = 0
+        cache_installs = []
+        pending_downloads = []
+        cache_index = load_cache_index(progress)
+        cached_by_sha1 = cached_files_by_sha1(cache_index)
         for file_entry in index.get("files", []):
             path = file_entry.get("path", "")
             
@@ -519,97 +887,81 @@ def extract_mrpack(mrpack_file, extract_dir):
                         processed_count += 1
                         continue
                 
-                # Check if mod already exists in cache
-                cache_file = os.path.join(CACHE_DIR, mod_filename)
-                if os.path.exists(cache_file):
+                # Check if mod already exists in cache, by hash when the index lists one
+                expected_sha1 = file_entry.get("hashes", {}).get("sha1")
+                if expected_sha1:
+                    cached_name = cached_by_sha1.get(expected_sha1)
+                    cache_file = os.path.join(CACHE_DIR, cached_name) if cached_name else None
+                else:
+                    cache_file = os.path.join(CACHE_DIR, mod_filename)
+                
+                if cache_file and os.path.exists(cache_file):
                     print(f"  Using cached version of {mod_filename}")
-                    shutil.copy2(cache_file, os.path.join(extract_dir, mod_filename))
-                    processed_count += 1
+                    cache_installs.append((cache_file, os.path.join(extract_dir, mod_filename)))
                     continue
                 
-                # Download the mod
-                for download_url in download_urls:
-                    try:
-                        print(f"  Downloading {mod_filename} from {download_url}")
-                        response = requests.get(download_url, stream=True)
-                        response.raise_for_status()
-                        
-                        # Save to mods directory
-                        with open(os.path.join(extract_dir, mod_filename), 'wb') as out_file:
-                            for chunk in response.iter_content(chunk_size=8192):
-                                if chunk:
-                                    out_file.write(chunk)
-                        
-                        # Also save to cache
-                        shutil.copy2(os.path.join(extract_dir, mod_filename), cache_file)
-                        
-                        processed_count += 1
-                        break  # Stop after successful download
-                    except Exception as e:
-                        print(f"  Error downloading {mod_filename}: {str(e)}")
-                        # Continue to next URL if available
+                # Queue the mod for download
+                pending_downloads.append((mod_filename, download_urls, expected_sha1))
+        
+        # Install all cached mods at once
+        mod_explorer.map_concurrently(mod_explorer.link_or_copy, cache_installs, FILE_WORKERS)
+        processed_count += len(cache_installs)
+        
+        # Download all queued mods concurrently
+        if pending_downloads:
+            print(f"  Downloading {len(pending_downloads)} mods...")
+            results = mod_explorer.run_concurrently(fetch_mod_file, [
+                (mod_filename, download_urls, os.path.join(extract_dir, mod_filename), expected_sha1)
+                for mod_filename, download_urls, expected_sha1 in pending_downloads
+            ])
+            processed_count += sum(1 for result in results if result)
+            
+            # Verified downloads are now in the cache under their known hash
+            for (mod_filename, _, expected_sha1), result in zip(pending_downloads, results):
+                if result and expected_sha1:
+                    index_cached_file(cache_index, expected_sha1, mod_filename)
+            mark_progress_dirty(progress)
         
         # Extract override files if present
-        for override_dir in ["overrides", "server-overrides"]:
-            for file_info in zipf.infolist():
-                if file_info.filename.startswith(f"{override_dir}/"):
-                    # Remove the override directory prefix
-                    relative_path = file_info.filename[len(f"{override_dir}/"):]
-                    if not relative_path:
-                        continue  # Skip the directory itself
-                    
-                    # Determine the target path
-                    target_path = os.path.join(ROOT_DIR, relative_path)
-                    
-                    # Create directories if needed
-                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                    
-                    # Extract the file
-                    source = zipf.read(file_info.filename)
-                    with open(target_path, 'wb') as target_file:
-                        target_file.write(source)
+        extract_overrides(zipf, override_names, ["overrides", "server-overrides"], ROOT_DIR)
         
         print(f"Modpack processing complete: {processed_count} mods installed from {modpack_name}")
     
-    # Clean up temporary directory
-    shutil.rmtree(temp_dir)
-    
     # Move the original .mrpack file to cache and remove from mods directory
     mrpack_filename = os.path.basename(mrpack_file)
     cache_mrpack = os.path.join(CACHE_DIR, mrpack_filename)
     if not os.path.exists(cache_mrpack):
-        shutil.copy2(mrpack_file, cache_mrpack)
+        mod_explorer.link_or_copy(mrpack_file, cache_mrpack)
+        mod_explorer.mark_cached(mrpack_filename)
     
     # Remove the .mrpack file from the mods directory
     print(f"  Removing {mrpack_filename} from mods directory (saved in cache)")
     os.remove(mrpack_file)
     
+    mods_snapshot(refresh=True)
+    
     return True
 
 
-def process_mrpack_files():
+def process_mrpack_files(progress=None):
     """Process all .mrpack files in the mods directory"""
-    mrpack_files = [f for f in os.listdir(MODS_DIR) if f.endswith('.mrpack')]
-    if not mrpack_files:
-        return
-    
-    print("\n=== Processing Modpack Files ===")
-    for mrpack_file in mrpack_files:
-        extract_mrpack(os.path.join(MODS_DIR, mrpack_file), MODS_DIR)
+    check_and_process_mrpack_downloads(progress)
 
 
-def print_summary():
+def print_summary(progress):
     """Print summary information about the installation"""
-    mod_count = len([f for f in os.listdir(MODS_DIR) if f.endswith('.jar')])
-    mrpack_count = len([f for f in os.listdir(MODS_DIR) if f.endswith('.mrpack')])
-    cache_count = len([f for f in os.listdir(CACHE_DIR) 
-                      if os.path.isfile(os.path.join(CACHE_DIR, f)) and 
-                      (f.endswith('.jar') or f.endswith('.mrpack'))])
-    
-    # Get cache size
-    cache_size = sum(os.path.getsize(os.path.join(CACHE_DIR, f)) 
-                     for f in os.listdir(CACHE_DIR) 
-                     if os.path.isfile(os.path.join(CACHE_DIR, f)))
+    # Count mods and modpacks in a single pass over the directory snapshot
+    mod_count = mrpack_count = 0
+    for filename in mods_snapshot():
+        if filename.endswith('.jar'):
+            mod_count += 1
+        elif filename.endswith('.mrpack'):
+            mrpack_count += 1
+    
+    # Cache count and size come from the cache index instead of stat'ing every file
+    cache_index = load_cache_index(progress)
+    cache_count = len(cache_index)
+    cache_size = sum(entry["size"] for entry in cache_index.values())
     cache_size_mb = cache_size / (1024 * 1024)
     
     print("\nUltimate Adventure Mod Pack installation complete!")
@@ -659,42 +1011,25 @@ def download_from_profile(adventure_profile, progress, force=False):
     
     print("\n=== Downloading mods from profile ===")
     
-    # Read the profile and categorize mods
-    with open(adventure_profile, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            
-            # Parse mod type and filename
-            parts = line.split(']', 1)
-            print(f"Line {line_num}: {line}")
-            print(f"Parts: {parts}")
-            
-            if len(parts) < 2 or not parts[0].startswith('['):
-                print(f"Warning: Line {line_num} does not have the expected [type] format")
-                continue
-            
-            mod_type = parts[0][1:].strip()
-            mod_file = parts[1].strip()
-            
-            print(f"Parsed type: '{mod_type}', file: '{mod_file}'")
-            
-            if not mod_file:
-                continue
-            
-            # Categorize by type
-            if mod_type == "server":
-                server_mods.append(mod_file)
-            elif mod_type == "client":
-                client_mods.append(mod_file)
-            elif mod_type == "shared":
-                shared_mods.append(mod_file)
+    # Categorize mods by type
+    for mod_type, mod_file in parse_profile(adventure_profile):
+        print(f"Parsed type: '{mod_type}', file: '{mod_file}'")
+        
+        if mod_type == "server":
+            server_mods.append(mod_file)
+        elif mod_type == "client":
+            client_mods.append(mod_file)
+        elif mod_type == "shared":
+            shared_mods.append(mod_file)
     
     print(f"Server mods: {server_mods}")
     print(f"Client mods: {client_mods}")
     print(f"Shared mods: {shared_mods}")
     
+    # Collect the mods that can come from the cache and those that need a network download
+    cache_installs = []
+    download_jobs = []
+    
     # Download server and shared mods
     for mod_list, mod_type in [(shared_mods, "shared"), (server_mods, "server")]:
         for mod_file in mod_list:
@@ -709,7 +1044,7 @@ def download_from_profile(adventure_profile, progress, force=False):
             # Try to find the file in cache first
             if os.path.exists(cache_path) and not force:
                 print(f"Using cached version of {mod_file}")
-                shutil.copy2(cache_path, mod_path)
+                cache_installs.append((cache_path, mod_path))
                 continue
             
             # Otherwise, try to download it
@@ -721,11 +1056,8 @@ def download_from_profile(adventure_profile, progress, force=False):
                 # We assume Fabric API is already in the mods folder or will be downloaded manually
                 continue
             
-            # Download mod using mod_explorer.py
-            if download_mod(f"{mod_type.capitalize()} Mod", search_term, 1, force):
-                success = success and True
-            else:
-                success = False
+            # Download mod using mod_explorer.py; .mrpack files are extracted by the caller
+            download_jobs.append((download_mod, (f"{mod_type.capitalize()} Mod", search_term, 1, force, False)))
     
     # Save client-only mods to cache for client pack creation
     for mod_file in client_mods:
@@ -736,155 +1068,146 @@ def download_from_profile(adventure_profile, progress, force=False):
             print(f"Client-only mod {mod_file} already in cache")
             continue
         
-        # Try to download client-only mod to cache
-        search_term = mod_file.split('-')[0].lower()
-        
-        print(f"Downloading client-only mod {mod_file} to cache...")
-        # Use a slightly modified version of download_mod that saves directly to cache
-        
-        # Build command arguments
-        cmd = [
-            "python3", 
-            os.path.join(SCRIPT_DIR, "mod_explorer.py"),
-            "--source", "modrinth",
-            "--mc-version", MC_VERSION,
-            "--loader", LOADER,
-            "--search", search_term,
-            "--limit", "1",
-            "--download",
-            "--output", CACHE_DIR,  # Save directly to cache
-            "--cache-dir", CACHE_DIR
-        ]
-        
-        if force:
-            cmd.append("--force-download")
-        
-        try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            print(f"Successfully downloaded client-only mod to cache: {mod_file}")
-        except subprocess.CalledProcessError as e:
-            print(f"Failed to download client-only mod {mod_file}: {e}")
-            print(f"Error output: {e.stderr}")
-            success = False
+        download_jobs.append((download_client_mod, (mod_file, force)))
+    
+    if cache_installs:
+        print(f"Installing {len(cache_installs)} mods from cache...")
+        mod_explorer.map_concurrently(mod_explorer.link_or_copy, cache_installs, FILE_WORKERS)
+    
+    if download_jobs:
+        print(f"Downloading {len(download_jobs)} mods ({mod_explorer.DOWNLOAD_WORKERS} at a time)...")
+        # Each job is a (function, args) pair, since mods and client-only mods mix here
+        success = all(mod_explorer.run_concurrently(lambda func, args: func(*args), download_jobs)) and success
     
     return success
 
 
-def download_category(name, progress, force=False, profile_name="adventure_pack.txt"):
-    """Download a category of mods and update progress"""
+def download_client_mod(mod_file, force=False):
+    """Download a client-only mod straight into the cache for client pack creation"""
+    # Try to download client-only mod to cache
+    search_term = mod_file.split('-')[0].lower()
+    
+    print(f"Downloading client-only mod {mod_file} to cache...")
+    
+    try:
+        # Save directly to cache
+        success = mod_explorer.search_and_download(
+            search_term,
+            source="modrinth",
+            mc_version=MC_VERSION,
+            loader=LOADER,
+            limit=1,
+            output_dir=CACHE_DIR,
+            force_download=force,
+            use_cache=not force
+        )
+    except Exception as e:
+        print(f"Failed to download client-only mod {mod_file}: {e}")
+        return False
+    
+    if not success:
+        print(f"Failed to download client-only mod {mod_file}")
+        return False
+    
+    print(f"Successfully downloaded client-only mod to cache: {mod_file}")
+    return True
+
+
+def download_category(name, progress, done, force=False, profile_name="adventure_pack.txt"):
+    """
+    Download a category of mods and update progress
+    
+    done is the set of categories already marked as downloaded in progress; it is
+    updated when the category succeeds.
+    """
     # Check if we have a profile to use
     profile_path = os.path.join(MODPACK_DIR, profile_name)
-    if os.path.exists(profile_path):
-        if name == "from-profile":
-            return download_from_profile(profile_path, progress, force)
-        
-        # If not explicitly asking for profile, but profile exists,
-        # we'll still use it and ignore categories
-        if name in progress["categories"] and progress["categories"][name] and not force:
-            print(f"Skipping {name} (already downloaded)")
-            return True
-    else:
-        # Use the traditional category-based approach
-        if name in progress["categories"] and progress["categories"][name] and not force:
-            print(f"Skipping {name} (already downloaded)")
-            return True
+    if name == "from-profile" and os.path.exists(profile_path):
+        return download_from_profile(profile_path, progress, force)
+    
+    if name in done and not force:
+        print(f"Skipping {name} (already downloaded)")
+        return True
     
     print(f"\n=== Downloading {name} ===")
     success = True
     
     if name == "essential-dependencies":
-        print("WARNING: Using static Fabric API version - do not download dynamically")
         # IMPORTANT: We use a static version of Fabric API (fabric-api-1.21.5.jar)
-        # DO NOT uncomment the following line as it might download an incompatible version
-        # success = download_mod("Fabric API", "fabric api", 1) and success
-    
-    elif name == "performance-mods":
-        success = download_mod("Performance Mods", "lithium", 1) and success
-        success = download_mod("Performance Mods", "ferrite", 1) and success
-        success = download_mod("Performance Mods", "starlight", 1) and success
-        success = download_mod("Performance Mods", "entityculling", 1) and success
-        success = download_mod("Performance Mods", "memo", 1) and success
-        success = download_mod("Performance Mods", "lazyDFU", 1) and success
-        success = download_mod("Performance Mods", "immediatelyfast", 1) and success
-    
-    elif name == "adventure-mods":
-        success = download_mod("Adventure Mods", "adventure", 5) and success
-    
-    elif name == "high-quality-mods":
-        success = download_mod("Better Combat", "bettercombat", 1) and success
-        success = download_mod("Better Villages", "villager", 3) and success
-        # Skip magic-bundle as it requires client-side dependencies
-        # success = download_mod("Magic Mods", "magic", 3) and success
-        success = download_mod("Grind Mods", "grind", 2) and success
-        success = download_mod("RPG", "rpg", 3) and success
-        # NOTE: RPG Stash will be filtered out in cleanup step due to missing dependency 'lithostitched'
+        print("WARNING: Using static Fabric API version - do not download dynamically")
     
-    elif name == "world-generation-mods":
-        success = download_mod("World Generation", "terrain", 3) and success
-        success = download_mod("World Generation", "biome", 3) and success
-        # NOTE: Biome Replacer will be filtered out in cleanup step due to incompatibility with Minecraft 1.21.5
-        success = download_mod("World Generation", "structure", 3) and success
-        success = download_mod("World Generation", "exploration", 3) and success
+    # Run the category's searches concurrently; .mrpack files are extracted by the caller
+    searches = CATEGORY_SPECS.get(name, [])
+    if searches:
+        success = all(mod_explorer.run_concurrently(download_mod, [
+            (label, search_term, limit, False, False)
+            for label, search_term, limit in searches
+        ]))
     
-    elif name == "dungeon-exploration-mods":
-        success = download_mod("Dungeons", "dungeon", 5) and success
-        # NOTE: DungeonDodge+ will be filtered out in cleanup step due to client-side compatibility issues
-        success = download_mod("Exploration", "exploration", 5) and success
-        success = download_mod("Ruins", "ruins", 3) and success
-        # NOTE: Philip's Ruins will be filtered out in cleanup step due to incompatibility with Minecraft 1.21.5
+    # Mark category as downloaded if successful
+    if success:
+        progress["categories"][name] = True
+        done.add(name)
+        mark_progress_dirty(progress)
     
-    elif name == "quest-mods":
-        success = download_mod("Quest Mods", "quest", 3) and success
-        success = download_mod("Quest Mods", "mission", 2) and success
+    return success
+
+
+def write_client_zip(output_zip, entries):
+    """
+    Write the client pack zip from (source_path, arcname) entries.
     
-    elif name == "boss-combat-mods":
-        success = download_mod("Boss Mods", "boss", 3) and success
-        # Skip combat-control as it requires client-side dependencies
-        # success = download_mod("Combat Mods", "combat", 3) and success
-        success = download_mod("Combat Mods", "weapon", 3) and success
-        # NOTE: More Weapon Variants will be filtered out in cleanup step due to missing dependency 'mstv-base'
+    entries may be any iterable, including one fed from another thread while the pack
+    is still being assembled. Jars are already deflate-compressed archives, so they are
+    stored as-is instead of being compressed a second time; only text and config files
+    get deflated. An arcname seen before is skipped.
+    """
+    written = set()
+    with zipfile.ZipFile(output_zip, 'w', compression=zipfile.ZIP_DEFLATED) as out_zip:
+        for source_path, arcname in entries:
+            if arcname in written:
+                continue
+            written.add(arcname)
+            
+            if arcname.endswith(('.jar', '.zip')):
+                out_zip.write(source_path, arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                out_zip.write(source_path, arcname)
+
+
+def start_client_zip_writer(output_zip):
+    """
+    Start write_client_zip on a background thread fed by a queue.
     
-    elif name == "animal-creature-mods":
-        success = download_mod("Animals", "animals", 3) and success
-        success = download_mod("Mobs", "creature", 3) and success
-        success = download_mod("Mobs", "monster", 3) and success
+    Returns (add_entry, finish): add_entry(source_path, arcname) queues a file as soon
+    as it is in place, so zipping overlaps with the remaining copies and downloads, and
+    finish() closes the queue, waits for the zip and returns the writer's error, if any.
+    Only the writer thread ever touches the output zip.
+    """
+    entry_queue = queue.Queue()
+    errors = []
     
-    elif name == "item-equipment-mods":
-        success = download_mod("Items", "item", 3) and success
-        success = download_mod("Equipment", "equipment", 3) and success
-        # NOTE: Take's Armory will be filtered out in cleanup step due to missing dependency 'tlib'
-        success = download_mod("Tools", "tools", 3) and success
-        # NOTE: More Tools and Armor will be filtered out in cleanup step due to missing dependency 'modmenu'
+    def writer():
+        try:
+            write_client_zip(output_zip, iter(entry_queue.get, None))
+        except Exception as e:
+            errors.append(e)
+            # Keep draining so producers never block on a dead writer
+            for _ in iter(entry_queue.get, None):
+                pass
     
-    elif name == "qol-mods":
-        # Comment out this client-side mod that's causing issues
-        # success = download_mod("QoL", "inventory", 2) and success
-        success = download_mod("QoL", "crafting", 2) and success
-        success = download_mod("QoL", "minimap", 1) and success
-        success = download_mod("QoL", "map", 2) and success
+    thread = threading.Thread(target=writer, name="client-zip-writer", daemon=True)
+    thread.start()
     
-    elif name == "furniture-decoration-mods":
-        success = download_mod("Furniture", "furniture", 5) and success
-        # Comment out Better Chroma Key which is client-side
-        # success = download_mod("Decoration", "decoration", 5) and success
-        success = download_mod("Decoration", "decoration", 5) and success
-        success = download_mod("Polymer", "polymer", 2) and success
-        success = download_mod("Furniture Kits", "kits", 3) and success
-        success = download_mod("Chairs", "chairs", 2) and success
-        success = download_mod("Tables", "tables", 2) and success
-    
-    elif name == "required-dependencies":
-        success = download_mod("Dependencies", "collective", 1) and success
-        success = download_mod("Dependencies", "cloth-config fabric", 1) and success
-        success = download_mod("Dependencies", "extended_drawers", 1) and success
-        success = download_mod("Dependencies", "quad", 1) and success
+    def add_entry(source_path, arcname):
+        entry_queue.put((source_path, arcname))
     
-    # Mark category as downloaded if successful
-    if success:
-        progress["categories"][name] = True
-        save_progress(progress)
+    def finish():
+        entry_queue.put(None)
+        thread.join()
+        return errors[0] if errors else None
     
-    return success
+    return add_entry, finish
 
 
 def create_client_pack(profile_name="adventure_pack.txt"):
@@ -951,6 +1274,11 @@ ENJOY YOUR ADVENTURE!
     with open(os.path.join(CLIENT_PACK_DIR, "README.txt"), 'w') as f:
         f.write(readme_content)
     
+    # Zip files on a writer thread as they are placed in the client pack directory
+    print("Creating client modpack zip file...")
+    add_zip_entry, finish_zip = start_client_zip_writer(OUTPUT_ZIP)
+    add_zip_entry(os.path.join(CLIENT_PACK_DIR, "README.txt"), "README.txt")
+    
     # Copy client-compatible mods
     print("Copying mods to client pack...")
     
@@ -962,138 +1290,114 @@ ENJOY YOUR ADVENTURE!
     # Create a set to track mods we've already added to avoid duplicates
     added_mods = set()
     
+    # Override files extracted from mrpacks, zipped once at the end
+    override_files = set()
+    
+    # Read the cache and server mods directories once instead of checking each file
+    with os.scandir(CACHE_DIR) as entries:
+        cache_set = {entry.name for entry in entries}
+    mods_set = mods_snapshot(refresh=True)
+    
     # Read the profile and copy mods
     if os.path.exists(profile_path):
-        with open(profile_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Parse mod type and filename
-                parts = line.split(']', 1)
-                if len(parts) < 2 or not parts[0].startswith('['):
-                    continue
-                
-                mod_type = parts[0][1:].strip()
-                mod_file = parts[1].strip()
+        for mod_type, mod_file in parse_profile(profile_path):
+            # Skip server-only mods
+            if mod_type == "server":
+                print(f"Skipping server-only mod: {mod_file}")
+                continue
+            
+            # Process shared mods and client-only mods
+            if mod_type in ["shared", "client"]:
+                # Download from cache directory first
+                cache_file_path = os.path.join(CACHE_DIR, mod_file)
+                server_file_path = os.path.join(MODS_DIR, mod_file)
                 
-                if not mod_file:
+                # Check if the mod is already in our added set
+                if mod_file in added_mods:
+                    print(f"Skipping already added mod: {mod_file}")
                     continue
                 
-                # Skip server-only mods
-                if mod_type == "server":
-                    print(f"Skipping server-only mod: {mod_file}")
-                    continue
+                added_mods.add(mod_file)
                 
-                # Process shared mods and client-only mods
-                if mod_type in ["shared", "client"]:
-                    # Download from cache directory first
-                    cache_file_path = os.path.join(CACHE_DIR, mod_file)
-                    server_file_path = os.path.join(MODS_DIR, mod_file)
-                    
-                    # Check if the mod is already in our added set
-                    if mod_file in added_mods:
-                        print(f"Skipping already added mod: {mod_file}")
-                        continue
+                if mod_file.endswith('.mrpack'):
+                    # For .mrpack files, read client mods straight from the archive
+                    source_path = None
+                    if mod_file in cache_set:
+                        source_path = cache_file_path
+                    elif mod_file in mods_set:
+                        source_path = server_file_path
                     
-                    added_mods.add(mod_file)
-                    
-                    if mod_file.endswith('.mrpack'):
-                        # For .mrpack files, create a temporary directory to extract client mods
-                        temp_extract_dir = os.path.join(CACHE_DIR, "temp_client_extract")
-                        os.makedirs(temp_extract_dir, exist_ok=True)
-                        
-                        source_path = None
-                        if os.path.exists(cache_file_path):
-                            source_path = cache_file_path
-                        elif os.path.exists(server_file_path):
-                            source_path = server_file_path
+                    if source_path:
+                        print(f"Extracting client mods from {mod_file}...")
                         
-                        if source_path:
-                            print(f"Extracting client mods from {mod_file}...")
-                            
-                            # Extract client-only mods from the mrpack
-                            with zipfile.ZipFile(source_path, 'r') as zipf:
-                                # Extract and parse the index file
-                                try:
-                                    zipf.extract("modrinth.index.json", temp_extract_dir)
-                                    
-                                    with open(os.path.join(temp_extract_dir, "modrinth.index.json"), 'r') as f:
-                                        index = json.load(f)
+                        # Extract client-only mods from the mrpack
+                        with zipfile.ZipFile(source_path, 'r') as zipf:
+                            # Parse the index file in memory
+                            try:
+                                index, override_names = read_mrpack_index(source_path, zipf)
+                                pending_downloads = []
+                                
+                                # Process files from the index
+                                for file_entry in index.get("files", []):
+                                    path = file_entry.get("path", "")
                                     
-                                    # Process files from the index
-                                    for file_entry in index.get("files", []):
-                                        path = file_entry.get("path", "")
-                                        
-                                        # Include files that are usable by clients
-                                        env = file_entry.get("env", {})
-                                        if env.get("client") != "unsupported":
-                                            if path.endswith(".jar") and ("mods/" in path or path.startswith("mods/")):
-                                                mod_filename = os.path.basename(path)
-                                                
-                                                # Check if file exists in the cache directory first
-                                                cache_mod_path = os.path.join(CACHE_DIR, mod_filename)
-                                                if os.path.exists(cache_mod_path):
-                                                    print(f"  Including cached mod: {mod_filename}")
-                                                    shutil.copy2(cache_mod_path, os.path.join(CLIENT_MODS_DIR, mod_filename))
+                                    # Include files that are usable by clients
+                                    env = file_entry.get("env", {})
+                                    if env.get("client") != "unsupported":
+                                        if path.endswith(".jar") and ("mods/" in path or path.startswith("mods/")):
+                                            mod_filename = os.path.basename(path)
+                                            
+                                            client_mod_path = os.path.join(CLIENT_MODS_DIR, mod_filename)
+                                            
+                                            # Check if file exists in the cache directory first, then in the server mods directory
+                                            source_mod_path = None
+                                            if mod_filename in cache_set:
+                                                print(f"  Including cached mod: {mod_filename}")
+                                                source_mod_path = os.path.join(CACHE_DIR, mod_filename)
+                                            elif mod_filename in mods_set:
+                                                print(f"  Including mod from server mods directory: {mod_filename}")
+                                                source_mod_path = os.path.join(MODS_DIR, mod_filename)
+                                            
+                                            if source_mod_path:
+                                                try:
+                                                    mod_explorer.link_or_copy(source_mod_path, client_mod_path)
+                                                    add_zip_entry(client_mod_path, f"mods/{mod_filename}")
                                                     copied_count += 1
-                                                # Check if file exists in the server mods directory
-                                                elif os.path.exists(os.path.join(MODS_DIR, mod_filename)):
-                                                    print(f"  Including mod from server mods directory: {mod_filename}")
-                                                    shutil.copy2(os.path.join(MODS_DIR, mod_filename), 
-                                                               os.path.join(CLIENT_MODS_DIR, mod_filename))
-                                                    copied_count += 1
-                                                else:
-                                                    # Otherwise download it
-                                                    download_urls = file_entry.get("downloads", [])
-                                                    if download_urls:
-                                                        for download_url in download_urls:
-                                                            try:
-                                                                print(f"  Downloading client mod: {mod_filename}")
-                                                                response = requests.get(download_url, stream=True)
-                                                                response.raise_for_status()
-                                                                
-                                                                with open(os.path.join(CLIENT_MODS_DIR, mod_filename), 'wb') as out_file:
-                                                                    for chunk in response.iter_content(chunk_size=8192):
-                                                                        if chunk:
-                                                                            out_file.write(chunk)
-                                                                
-                                                                # Also save to cache
-                                                                shutil.copy2(os.path.join(CLIENT_MODS_DIR, mod_filename), 
-                                                                           os.path.join(CACHE_DIR, mod_filename))
-                                                                
-                                                                copied_count += 1
-                                                                break  # Stop after successful download
-                                                            except Exception as e:
-                                                                print(f"  Error downloading client mod {mod_filename}: {str(e)}")
-                                    
-                                    # Extract client-specific override files
-                                    for override_dir in ["overrides"]:  # Just use client overrides, not server-overrides
-                                        client_override_dir = os.path.join(CLIENT_PACK_DIR, "overrides")
-                                        os.makedirs(client_override_dir, exist_ok=True)
-                                        
-                                        for file_info in zipf.infolist():
-                                            if file_info.filename.startswith(f"{override_dir}/"):
-                                                # Remove the override directory prefix
-                                                relative_path = file_info.filename[len(f"{override_dir}/"):]
-                                                if not relative_path:
-                                                    continue  # Skip the directory itself
-                                                
-                                                # Determine the target path
-                                                target_path = os.path.join(client_override_dir, relative_path)
-                                                
-                                                # Create directories if needed
-                                                os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                                                
-                                                # Extract the file
-                                                source = zipf.read(file_info.filename)
-                                                with open(target_path, 'wb') as target_file:
-                                                    target_file.write(source)
-                                        
-                                    # Create a client installation instructions file
-                                    with open(os.path.join(CLIENT_PACK_DIR, "OVERRIDES_INSTRUCTIONS.txt"), 'w') as f:
-                                        f.write("""
+                                                    continue
+                                                except FileNotFoundError:
+                                                    print(f"  {mod_filename} disappeared from {os.path.dirname(source_mod_path)}, downloading it instead")
+                                            
+                                            # Otherwise queue it for download
+                                            download_urls = file_entry.get("downloads", [])
+                                            if download_urls:
+                                                pending_downloads.append((
+                                                    mod_filename,
+                                                    download_urls,
+                                                    file_entry.get("hashes", {}).get("sha1")
+                                                ))
+                                
+                                # Download all queued client mods concurrently
+                                if pending_downloads:
+                                    print(f"  Downloading {len(pending_downloads)} client mods...")
+                                    results = mod_explorer.run_concurrently(fetch_mod_file, [
+                                        (mod_filename, download_urls, os.path.join(CLIENT_MODS_DIR, mod_filename), expected_sha1)
+                                        for mod_filename, download_urls, expected_sha1 in pending_downloads
+                                    ])
+                                    for (mod_filename, _, _), result in zip(pending_downloads, results):
+                                        if result:
+                                            add_zip_entry(os.path.join(CLIENT_MODS_DIR, mod_filename), f"mods/{mod_filename}")
+                                            copied_count += 1
+                                            cache_set.add(mod_filename)
+                                
+                                # Extract client-specific override files
+                                # Just use client overrides, not server-overrides
+                                client_override_dir = os.path.join(CLIENT_PACK_DIR, "overrides")
+                                os.makedirs(client_override_dir, exist_ok=True)
+                                override_files.update(extract_overrides(zipf, override_names, ["overrides"], client_override_dir))
+                                
+                                # Create a client installation instructions file
+                                with open(os.path.join(CLIENT_PACK_DIR, "OVERRIDES_INSTRUCTIONS.txt"), 'w') as f:
+                                    f.write("""
 OVERRIDES INSTALLATION INSTRUCTIONS:
 ------------------------------------
 The "overrides" folder contains additional configuration files and resources.
@@ -1105,46 +1409,59 @@ Copy all contents from the "overrides" folder to your .minecraft directory:
 
 This will install all necessary configuration files for the modpack.
 """)
-                                
-                                except Exception as e:
-                                    print(f"Error processing modpack for client: {str(e)}")
-                                
-                                finally:
-                                    # Clean up temp directory
-                                    shutil.rmtree(temp_extract_dir, ignore_errors=True)
-                        else:
-                            print(f"Warning: Could not find .mrpack file: {mod_file}")
+                            
+                            except Exception as e:
+                                print(f"Error processing modpack for client: {str(e)}")
                     else:
-                        # For normal .jar files, try to find the file
-                        source_path = None
-                        if os.path.exists(cache_file_path):
-                            source_path = cache_file_path
-                        elif os.path.exists(server_file_path):
-                            source_path = server_file_path
+                        print(f"Warning: Could not find .mrpack file: {mod_file}")
+                else:
+                    # For normal .jar files, try to find the file
+                    source_path = None
+                    if mod_file in cache_set:
+                        source_path = cache_file_path
+                    elif mod_file in mods_set:
+                        source_path = server_file_path
+                    
+                    if source_path:
+                        print(f"Adding mod to client pack: {mod_file}")
+                        client_mod_path = os.path.join(CLIENT_MODS_DIR, mod_file)
+                        try:
+                            mod_explorer.link_or_copy(source_path, client_mod_path)
+                        except FileNotFoundError:
+                            print(f"Warning: Mod file disappeared before it could be copied: {mod_file}")
+                            continue
+                        add_zip_entry(client_mod_path, f"mods/{mod_file}")
                         
-                        if source_path:
-                            print(f"Adding mod to client pack: {mod_file}")
-                            shutil.copy2(source_path, os.path.join(CLIENT_MODS_DIR, mod_file))
+                        if mod_type == "shared":
+                            shared_count += 1
+                        else:  # client
+                            client_only_count += 1
                             
-                            if mod_type == "shared":
-                                shared_count += 1
-                            else:  # client
-                                client_only_count += 1
-                                
-                            copied_count += 1
-                        else:
-                            # If mod not found, try to download it from the Internet
-                            print(f"Warning: Mod file not found in cache or server mods: {mod_file}")
-                            # Here you could implement additional download logic for common mods
+                        copied_count += 1
+                    else:
+                        # If mod not found, try to download it from the Internet
+                        print(f"Warning: Mod file not found in cache or server mods: {mod_file}")
+                        # Here you could implement additional download logic for common mods
+    
+    # Overrides and instructions may be rewritten by several mrpacks, so queue their final versions last
+    for source_path in sorted(override_files):
+        add_zip_entry(source_path, os.path.relpath(source_path, CLIENT_PACK_DIR))
+    instructions_path = os.path.join(CLIENT_PACK_DIR, "OVERRIDES_INSTRUCTIONS.txt")
+    if os.path.exists(instructions_path):
+        add_zip_entry(instructions_path, "OVERRIDES_INSTRUCTIONS.txt")
+    
+    zip_error = finish_zip()
     
     # If no mods were copied, exit with error
     if copied_count == 0:
         print("Error: No mods copied to client pack!")
+        if os.path.exists(OUTPUT_ZIP):
+            os.remove(OUTPUT_ZIP)
         return False
     
-    # Create zip file
-    print("Creating client modpack zip file...")
-    shutil.make_archive(os.path.splitext(OUTPUT_ZIP)[0], 'zip', CLIENT_PACK_DIR)
+    if zip_error:
+        print(f"Error creating client modpack zip file: {zip_error}")
+        return False
     
     # Get zip size
     zip_size = os.path.getsize(OUTPUT_ZIP) / (1024 * 1024)  # Size in MB
@@ -1165,15 +1482,33 @@ This will install all necessary configuration files for the modpack.
     return True
 
 
-def check_and_process_mrpack_downloads():
-    """Check for new .mrpack files and process them immediately after download"""
-    mrpack_files = [f for f in os.listdir(MODS_DIR) if f.endswith('.mrpack')]
+# (filename, st_mtime_ns) of the .mrpack files already handled this run
+PROCESSED_MRPACKS = set()
+
+
+def check_and_process_mrpack_downloads(progress=None):
+    """
+    Check for new .mrpack files and process them immediately after download
+    
+    Each mrpack is attempted once per run (a changed file counts as new), so
+    calling this after every category and again at the end does no repeated work.
+    """
+    # Downloads may have added files since the last scan
+    mrpack_files = []
+    for mrpack_file in sorted(mods_snapshot(refresh=True)):
+        if not mrpack_file.endswith('.mrpack'):
+            continue
+        key = (mrpack_file, os.stat(os.path.join(MODS_DIR, mrpack_file)).st_mtime_ns)
+        if key not in PROCESSED_MRPACKS:
+            mrpack_files.append((mrpack_file, key))
+    
     if not mrpack_files:
         return
     
     print("\n=== Processing New Modpack Files ===")
-    for mrpack_file in mrpack_files:
-        extract_mrpack(os.path.join(MODS_DIR, mrpack_file), MODS_DIR)
+    for mrpack_file, key in mrpack_files:
+        PROCESSED_MRPACKS.add(key)
+        extract_mrpack(os.path.join(MODS_DIR, mrpack_file), MODS_DIR, progress)
 
 
 def main():
@@ -1181,16 +1516,19 @@ def main():
     parser = argparse.ArgumentParser(description="Adventure Minecraft Mod Downloader")
     parser.add_argument("--reset", action="store_true", help="Reset download progress")
     parser.add_argument("--force", action="store_true", help="Force download of all mods")
-    parser.add_argument("--category", help="Download only this category")
+    parser.add_argument("--category", choices=CATEGORY_ORDER, help="Download only this category")
     parser.add_argument("--clean", action="store_true", help="Just clean up and organize mods")
     parser.add_argument("--client", action="store_true", help="Create client modpack")
     parser.add_argument("--all", action="store_true", help="Download mods and create client pack")
     parser.add_argument("--profile", action="store_true", help="Use profile-based download")
     parser.add_argument("--profile-name", default="adventure_pack.txt", help="Specify profile name to use (default: adventure_pack.txt)")
+    parser.add_argument("--rebuild-cache-index", action="store_true", help="Rehash every file in the mod cache")
+    parser.add_argument("--concurrency", type=int, default=mod_explorer.DOWNLOAD_WORKERS, help=f"Number of downloads to run at the same time (default: {mod_explorer.DOWNLOAD_WORKERS})")
     args = parser.parse_args()
     
     # Ensure all directories exist
     ensure_directories()
+    mod_explorer.set_download_workers(args.concurrency)
     
     # If --client is specified, just create the client pack
     if args.client:
@@ -1202,16 +1540,21 @@ def main():
     
     # Reset progress if requested
     if args.reset:
-        progress = {"categories": {}}
+        progress["categories"] = {}
         save_progress(progress)
         print("Download progress reset.")
     
+    # Rebuild the cache index if requested
+    if args.rebuild_cache_index:
+        cache_index = load_cache_index(progress, rebuild=True)
+        print(f"Cache index rebuilt: {len(cache_index)} files indexed.")
+    
     # Clean up if requested and exit
     if args.clean:
         fix_biome_spreader()
         cleanup_mods()
         save_mod_list()
-        print_summary()
+        print_summary(progress)
         return
     
     # Clean mods directory at start
@@ -1233,57 +1576,37 @@ def main():
             return
             
         print("Reading profile content:")
-        with open(profile_path, 'r') as f:
-            print(f.read())
+        print(read_profile(profile_path))
         
         download_from_profile(profile_path, progress, args.force)
-        check_and_process_mrpack_downloads()
+        check_and_process_mrpack_downloads(progress)
     else:
-        # Categories to download
-        all_categories = [
-            "essential-dependencies",
-            "performance-mods",
-            "adventure-mods",
-            "high-quality-mods",
-            "world-generation-mods",
-            "dungeon-exploration-mods",
-            "quest-mods",
-            "boss-combat-mods",
-            "animal-creature-mods", 
-            "item-equipment-mods",
-            "qol-mods",
-            "furniture-decoration-mods",
-            "required-dependencies"
-        ]
+        # Categories already downloaded in a previous run
+        done = {category for category, downloaded in progress["categories"].items() if downloaded}
         
         # If a specific category is provided, only download that one
         if args.category:
-            if args.category in all_categories:
-                success = download_category(args.category, progress, args.force)
-                if not success:
-                    print(f"Failed to download category {args.category}")
-                # Process any mrpack files immediately after this category download
-                check_and_process_mrpack_downloads()
-            else:
-                print(f"Unknown category: {args.category}")
-                print(f"Available categories: {', '.join(all_categories)}")
-                return
+            success = download_category(args.category, progress, done, args.force)
+            if not success:
+                print(f"Failed to download category {args.category}")
+            # Process any mrpack files immediately after this category download
+            check_and_process_mrpack_downloads(progress)
         else:
             # Download all categories
-            for category in all_categories:
-                download_category(category, progress, args.force)
+            for category in CATEGORY_ORDER:
+                download_category(category, progress, done, args.force)
                 # Process any mrpack files after each category
-                check_and_process_mrpack_downloads()
+                check_and_process_mrpack_downloads(progress)
     
     # Final steps
     fix_biome_spreader()
     cleanup_mods()
     
     # Process any remaining mrpack files (redundant but ensures nothing is missed)
-    process_mrpack_files()
+    process_mrpack_files(progress)
     
     # Print summary
-    print_summary()
+    print_summary(progress)
     
     # Create client pack if --all is specified
     if args.all:
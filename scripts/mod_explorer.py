@@ -13,17 +13,32 @@ This script allows you to:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
 import sys
 import argparse
+import codecs
+import contextlib
+import functools
+import gzip
 import hashlib
+import operator
 import shutil
-from tqdm import tqdm
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import time
-import webbrowser
+from types import MappingProxyType
 from colorama import init, Fore, Style
 
+# orjson is optional; it parses the larger API responses several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize colorama for cross-platform colored terminal output
 init()
 
@@ -47,115 +62,493 @@ MINECRAFT_GAME_ID = 432
 # Class ID for Minecraft Mods in CurseForge
 MC_MODS_CLASS_ID = 6
 
+# CurseForge mod loader type IDs by loader name
+CURSEFORGE_LOADER_IDS = {
+    "forge": 1,
+    "cauldron": 2,
+    "liteloader": 3,
+    "fabric": 4,
+    "quilt": 5
+}
+
 # Cache directory for downloaded mods
 DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mod_cache")
+CACHE_DIR = DEFAULT_CACHE_DIR
+
+# Filenames known to be in CACHE_DIR (loaded lazily) and whether CACHE_DIR has been created
+CACHE_INDEX = None
+CACHE_DIR_READY = False
+
+# Read/write size for streamed file downloads
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# How long a search's results are reused before the platforms are asked again (seconds)
+SEARCH_CACHE_TTL = 6 * 60 * 60
+
+# Number of dependency downloads to run at the same time
+DOWNLOAD_WORKERS = 8
+
+# Files at least this big are fetched as DOWNLOAD_WORKERS parallel byte ranges
+# when the server accepts range requests
+RANGE_DOWNLOAD_MIN_SIZE = 64 << 20
+
+# Progress bar shared by every download that is currently running, and how many there are
+PROGRESS_BAR = None
+PROGRESS_USERS = 0
+PROGRESS_LOCK = threading.Lock()
+
+# Downloads currently running, keyed by (filename, output directory), so that
+# mods sharing a dependency wait for one download instead of starting another
+DOWNLOADS_IN_FLIGHT = {}
+DOWNLOADS_LOCK = threading.Lock()
+
+def json_loads(data):
+    """Decode JSON from bytes or str, using orjson when it is installed."""
+    if orjson:
+        # orjson rejects a UTF-8 byte order mark, which json.loads skips over
+        if isinstance(data, bytes) and data.startswith(codecs.BOM_UTF8):
+            data = data[len(codecs.BOM_UTF8):]
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj):
+    """Encode obj as a JSON string, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+def response_json(response):
+    """Decode a response body, raising RequestException like response.json() if it is not valid JSON."""
+    try:
+        return json_loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.RequestException(f"Invalid JSON from {response.url}: {e}", response=response)
+
+# Retry policy shared by every session: transient errors back off exponentially
+# (0.5s, 1s, 2s, ...) and honour the server's Retry-After on 429/503. POST is
+# included because the CurseForge bulk lookups are read-only.
+HTTP_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(("GET", "HEAD", "POST")),
+    respect_retry_after_header=True
+)
+
+def make_session(headers):
+    """Create a requests session with pooled keep-alive connections, retries and default headers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=HTTP_RETRY
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(headers)
+    return session
+
+# One session per API, so every call reuses the same TCP + TLS connections
+MODRINTH_SESSION = make_session({
+    "User-Agent": USER_AGENT,
+    "Authorization": MODRINTH_API_KEY
+})
+CURSEFORGE_SESSION = make_session({
+    "User-Agent": USER_AGENT,
+    "Accept": "application/json",
+    "x-api-key": CURSEFORGE_API_KEY
+})
+
+# Mod files come from the platforms' CDN hosts, which need no API keys, so they get
+# their own session whose connections stay open across every download in a run
+DOWNLOAD_SESSION = make_session({"User-Agent": USER_AGENT})
+
+# Hosts each source serves mod files from, and those already connected to in this run
+DOWNLOAD_HOSTS = {
+    "modrinth": "https://cdn.modrinth.com/",
+    "curseforge": "https://edge.forgecdn.net/"
+}
+PRIMED_HOSTS = set()
+PRIMED_HOSTS_LOCK = threading.Lock()
+
+# Extra headers for CurseForge file downloads
+CURSEFORGE_DOWNLOAD_HEADERS = MappingProxyType({"Accept": "application/octet-stream"})
 
 # ================= HELPER FUNCTIONS =================
 
+def colored(text, color=Fore.WHITE, style=Style.NORMAL):
+    """Wrap text in the escape codes for the specified color and style."""
+    return f"{style}{color}{text}{Style.RESET_ALL}"
+
 def print_colored(text, color=Fore.WHITE, style=Style.NORMAL, end='\n'):
-    """Print text with specified color and style."""
-    print(f"{style}{color}{text}{Style.RESET_ALL}", end=end)
+    """Print text with specified color and style.
+    
+    While downloads are running the line is written around the shared progress bar,
+    so status lines from concurrent downloads do not tear through it.
+    """
+    line = colored(text, color, style) + end
+    bar = PROGRESS_BAR
+    if bar is None:
+        sys.stdout.write(line)
+        return
+    with type(bar).external_write_mode():
+        sys.stdout.write(line)
 
 def print_header(text):
     """Print a formatted header."""
-    print("\n" + "=" * 80)
-    print_colored(f" {text} ", Fore.CYAN, Style.BRIGHT)
-    print("=" * 80)
+    rule = "=" * 80
+    sys.stdout.write(f"\n{rule}\n{colored(f' {text} ', Fore.CYAN, Style.BRIGHT)}\n{rule}\n")
 
-def print_mod_info(mod, source="modrinth", detailed=False):
-    """Display information about a mod."""
-    if source == "modrinth":
-        title = mod.get('title', 'Unknown')
+class ModRecord:
+    """The fields of a search hit that are shown to the user and used to download it."""
+    
+    __slots__ = ("source", "mod_id", "slug", "title", "authors", "downloads", "updated", "description", "url")
+    
+    def __init__(self, source, mod_id, slug, title, authors, downloads, updated, description, url):
+        self.source = source
+        self.mod_id = mod_id
+        self.slug = slug
+        self.title = title
+        self.authors = authors
+        self.downloads = downloads
+        self.updated = updated
+        self.description = description
+        self.url = url
+    
+    @classmethod
+    def from_modrinth(cls, mod):
+        """Build a record from a Modrinth search hit or project."""
         slug = mod.get('slug', 'unknown')
-        mod_id = mod.get('project_id', mod.get('id', 'unknown'))
-        
-        print_colored(f"{title} ({slug}) [Modrinth]", Fore.GREEN, Style.BRIGHT)
-        
-        team = mod.get('team', [])
-        if team:
-            authors = ', '.join([author.get('name', 'Unknown') for author in team])
-            print_colored(f"Author: {authors}", Fore.YELLOW)
-        
-        downloads = mod.get('downloads', 0)
-        print_colored(f"Downloads: {downloads:,}", Fore.BLUE)
-        
-        if 'updated' in mod:
-            print_colored(f"Updated: {mod['updated'][:10]}", Fore.BLUE)
-        
-        if 'description' in mod:
-            description = mod['description']
-            if len(description) > 150 and not detailed:
-                description = description[:147] + "..."
-            print_colored(f"Description: {description}", Fore.WHITE)
-        
-        print_colored(f"URL: https://modrinth.com/mod/{slug}", Fore.CYAN)
-        print_colored(f"ID: {mod_id}", Fore.CYAN)
+        return cls(
+            "modrinth",
+            mod.get('project_id', mod.get('id', 'unknown')),
+            slug,
+            mod.get('title', 'Unknown'),
+            ', '.join([author.get('name', 'Unknown') for author in mod.get('team', [])]),
+            mod.get('downloads', 0),
+            mod.get('updated', '')[:10],
+            mod.get('description'),
+            f"https://modrinth.com/mod/{slug}"
+        )
     
-    elif source == "curseforge":
-        title = mod.get('name', 'Unknown')
+    @classmethod
+    def from_curseforge(cls, mod):
+        """Build a record from a CurseForge search hit or mod."""
         mod_id = mod.get('id', 'unknown')
-        
-        print_colored(f"{title} [CurseForge]", Fore.GREEN, Style.BRIGHT)
-        print_colored(f"ID: {mod_id}", Fore.CYAN)
-        
-        authors = mod.get('authors', [])
-        if authors:
-            authors_str = ', '.join([author.get('name', 'Unknown') for author in authors])
-            print_colored(f"Author: {authors_str}", Fore.YELLOW)
-        
-        downloads = mod.get('downloadCount', 0)
-        print_colored(f"Downloads: {downloads:,}", Fore.BLUE)
-        
-        if 'dateModified' in mod:
-            print_colored(f"Updated: {mod['dateModified'][:10]}", Fore.BLUE)
-        
-        summary = mod.get('summary', 'No description available')
-        if summary:
-            if len(summary) > 150 and not detailed:
-                summary = summary[:147] + "..."
-            print_colored(f"Summary: {summary}", Fore.WHITE)
-        
-        website_url = mod.get('links', {}).get('websiteUrl', f"https://www.curseforge.com/minecraft/mc-mods/{mod_id}")
-        print_colored(f"URL: {website_url}", Fore.CYAN)
+        return cls(
+            "curseforge",
+            mod_id,
+            mod.get('slug'),
+            mod.get('name', 'Unknown'),
+            ', '.join([author.get('name', 'Unknown') for author in mod.get('authors', [])]),
+            mod.get('downloadCount', 0),
+            mod.get('dateModified', '')[:10],
+            mod.get('summary', 'No description available'),
+            mod.get('links', {}).get('websiteUrl', f"https://www.curseforge.com/minecraft/mc-mods/{mod_id}")
+        )
+
+def format_mod_info(mod, detailed=False):
+    """Format the information shown about a ModRecord as one colored block of text."""
+    lines = []
+    
+    description = mod.description
+    if description and len(description) > 150 and not detailed:
+        description = description[:147] + "..."
+    
+    if mod.source == "modrinth":
+        lines.append(colored(f"{mod.title} ({mod.slug}) [Modrinth]", Fore.GREEN, Style.BRIGHT))
+        if mod.authors:
+            lines.append(colored(f"Author: {mod.authors}", Fore.YELLOW))
+        lines.append(colored(f"Downloads: {mod.downloads:,}", Fore.BLUE))
+        if mod.updated:
+            lines.append(colored(f"Updated: {mod.updated}", Fore.BLUE))
+        if description is not None:
+            lines.append(colored(f"Description: {description}", Fore.WHITE))
+        lines.append(colored(f"URL: {mod.url}", Fore.CYAN))
+        lines.append(colored(f"ID: {mod.mod_id}", Fore.CYAN))
+    
+    elif mod.source == "curseforge":
+        lines.append(colored(f"{mod.title} [CurseForge]", Fore.GREEN, Style.BRIGHT))
+        lines.append(colored(f"ID: {mod.mod_id}", Fore.CYAN))
+        if mod.authors:
+            lines.append(colored(f"Author: {mod.authors}", Fore.YELLOW))
+        lines.append(colored(f"Downloads: {mod.downloads:,}", Fore.BLUE))
+        if mod.updated:
+            lines.append(colored(f"Updated: {mod.updated}", Fore.BLUE))
+        if description:
+            lines.append(colored(f"Summary: {description}", Fore.WHITE))
+        lines.append(colored(f"URL: {mod.url}", Fore.CYAN))
+    
+    return "\n".join(lines) + "\n\n"
+
+def print_mod_info(mod, detailed=False):
+    """Display information about a ModRecord."""
+    sys.stdout.write(format_mod_info(mod, detailed))
+
+def map_concurrently(func, jobs, workers=None):
+    """Run func(*args) for each args tuple in jobs on a thread pool and return the results in order.
     
-    print()
+    The pool has workers threads, DOWNLOAD_WORKERS by default. The first job that
+    raises re-raises its exception here.
+    """
+    if not jobs:
+        return []
+    if len(jobs) == 1:
+        return [func(*jobs[0])]
+    
+    with ThreadPoolExecutor(max_workers=workers or DOWNLOAD_WORKERS) as executor:
+        return list(executor.map(lambda args: func(*args), jobs))
+
+def run_concurrently(func, jobs):
+    """Run func(*args) for each args tuple in jobs like map_concurrently.
+    
+    A job that raises is reported and counts as None.
+    """
+    def run(*args):
+        try:
+            return func(*args)
+        except Exception as e:
+            print_colored(f"Error: {e}", Fore.RED, Style.BRIGHT)
+            return None
+    
+    return map_concurrently(run, jobs)
+
+class HashingReader:
+    """File-like wrapper that hashes and reports every block read from a stream."""
+    
+    def __init__(self, stream, digest, callback):
+        self.stream = stream
+        self.digest = digest
+        self.callback = callback
+    
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.digest.update(data)
+        self.callback(len(data))
+        return data
+
+def file_sha1(path):
+    """Compute the SHA1 hex digest of a file."""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+ hashes the whole file in C without per-chunk Python overhead
+            return hashlib.file_digest(f, 'sha1').hexdigest()
+        
+        sha1 = hashlib.sha1()
+        buffer = bytearray(DOWNLOAD_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            sha1.update(view[:size])
+        return sha1.hexdigest()
+
+def curseforge_file_sha1(file_data):
+    """Get the SHA1 hash listed in CurseForge file metadata, if any."""
+    for file_hash in file_data.get('hashes', []):
+        if file_hash.get('algo') == 1:  # 1 = SHA1, 2 = MD5
+            return file_hash.get('value')
+    return None
+
+def set_cache_dir(cache_dir):
+    """Set the cache directory used for downloaded mods."""
+    global CACHE_DIR, CACHE_INDEX, CACHE_DIR_READY
+    CACHE_DIR = cache_dir or DEFAULT_CACHE_DIR
+    CACHE_INDEX = None
+    CACHE_DIR_READY = False
+
+def set_download_workers(workers):
+    """Set how many downloads run at the same time."""
+    global DOWNLOAD_WORKERS
+    DOWNLOAD_WORKERS = max(1, workers)
+
+def get_cache_index():
+    """Get the set of filenames in the cache, listing the cache directory on first use."""
+    global CACHE_INDEX
+    if CACHE_INDEX is None:
+        try:
+            with os.scandir(CACHE_DIR) as entries:
+                CACHE_INDEX = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            CACHE_INDEX = set()
+    return CACHE_INDEX
+
+def mark_cached(filename):
+    """Record a file that was written to the cache directory by someone else."""
+    get_cache_index().add(filename)
 
 def get_cache_path(filename, create=True):
     """Get the path to a cached file and create the cache directory if needed."""
-    if create and not os.path.exists(CACHE_DIR):
-        os.makedirs(CACHE_DIR)
+    global CACHE_DIR_READY
+    if create and not CACHE_DIR_READY:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        CACHE_DIR_READY = True
     
     return os.path.join(CACHE_DIR, filename)
 
 def is_in_cache(filename):
     """Check if a file exists in the cache."""
-    return os.path.exists(get_cache_path(filename, create=False))
+    return filename in get_cache_index()
+
+def link_or_copy(src, dst):
+    """Hard-link src to dst, copying the bytes only when a link is impossible (e.g. across filesystems).
+    
+    Linked files share their bytes, so anything that rewrites one of these paths must
+    write a new file and os.replace it there rather than truncate it in place.
+    """
+    if os.path.exists(dst):
+        if os.path.samefile(src, dst):
+            return
+        os.remove(dst)
+    
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
 
-def copy_from_cache(filename, output_dir):
-    """Copy a file from the cache to the output directory."""
+def copy_from_cache(filename, output_dir, expected_sha1=None):
+    """Copy a file from the cache to the output directory.
+    
+    When expected_sha1 is given, a cached file that does not match it (e.g. left
+    truncated by an interrupted download) is evicted and nothing is copied.
+    """
+    if not is_in_cache(filename):
+        return False
+    
     cache_path = get_cache_path(filename)
-    output_path = os.path.join(output_dir, filename)
+    try:
+        if expected_sha1 and file_sha1(cache_path) != expected_sha1.lower():
+            print_colored(f"Cached {filename} is corrupt, removing it...", Fore.YELLOW)
+            os.remove(cache_path)
+            get_cache_index().discard(filename)
+            return False
+        
+        link_or_copy(cache_path, os.path.join(output_dir, filename))
+    except FileNotFoundError:
+        # Removed from the cache behind our back
+        get_cache_index().discard(filename)
+        return False
+    
+    return True
+
+def read_gzip_json(path):
+    """Read a gzip-compressed JSON cache entry."""
+    with open(path, 'rb') as f:
+        return json_loads(gzip.decompress(f.read()))
+
+def write_gzip_json(path, obj):
+    """Write obj as a gzip-compressed JSON cache entry, creating its directory if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = gzip.compress(json_dumps(obj).encode("utf-8"), compresslevel=6)
+    # Write to a temporary file first so concurrent readers never see a partial entry
+    f = tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(path), delete=False)
+    try:
+        with f:
+            f.write(data)
+        os.replace(f.name, path)
+    except BaseException:
+        # Do not leave the temporary file behind in the cache
+        if os.path.exists(f.name):
+            os.unlink(f.name)
+        raise
+
+def api_cache_path(url, params=None):
+    """Get the path of the on-disk entry that caches an API response."""
+    key = url
+    if params:
+        key += "?" + json.dumps(params, sort_keys=True)
+    
+    return os.path.join(CACHE_DIR, "api_cache", hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json.gz")
+
+def cached_get_json(url, session=None, params=None):
+    """GET a JSON API endpoint, revalidating any cached copy with its ETag or Last-Modified date.
+    
+    Unchanged responses come back as an empty 304 and are served from the cache.
+    Each URL is requested at most once per run; repeat calls return the same object,
+    which callers must not modify.
+    The request goes through session, which defaults to MODRINTH_SESSION.
+    Raises requests.exceptions.RequestException on failure, like requests.get.
+    """
+    return _cached_get_json(url, session or MODRINTH_SESSION, tuple(sorted(params.items())) if params else None)
+
+def migrate_api_cache_entry(cache_path):
+    """Convert an entry left in the old uncompressed .json format to cache_path, returning its content.
+    
+    The old file is removed either way, so no stale entries stay behind in api_cache.
+    """
+    old_path = cache_path[:-len(".gz")]
+    if not os.path.exists(old_path):
+        return None
+    
+    cached = None
+    try:
+        with open(old_path, 'rb') as f:
+            cached = json_loads(f.read())
+        write_gzip_json(cache_path, cached)
+    except (OSError, ValueError):
+        cached = None
     
+    try:
+        os.remove(old_path)
+    except OSError:
+        pass
+    return cached
+
+@functools.lru_cache(maxsize=256)
+def _cached_get_json(url, session, param_items):
+    """Do the work of cached_get_json; params arrive as sorted items so they can be part of the memo key."""
+    params = dict(param_items) if param_items else None
+    cache_path = api_cache_path(url, params)
+    
+    cached = None
     if os.path.exists(cache_path):
-        shutil.copy2(cache_path, output_path)
-        return True
+        try:
+            cached = read_gzip_json(cache_path)
+        except (OSError, EOFError, ValueError):
+            cached = None
+    else:
+        cached = migrate_api_cache_entry(cache_path)
+    
+    request_headers = {}
+    if cached and cached.get('etag'):
+        request_headers["If-None-Match"] = cached['etag']
+    if cached and cached.get('last_modified'):
+        request_headers["If-Modified-Since"] = cached['last_modified']
+    
+    response = session.get(url, params=params, headers=request_headers)
+    if response.status_code == 304 and cached:
+        return cached['body']
+    
+    response.raise_for_status()
+    body = response_json(response)
+    
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        try:
+            write_gzip_json(cache_path, {'etag': etag, 'last_modified': last_modified, 'body': body})
+        except OSError as e:
+            print_colored(f"Could not cache API response for {url}: {e}", Fore.YELLOW)
     
-    return False
+    return body
 
 def save_to_cache(filename, from_path):
     """Save a file to the cache."""
-    cache_path = get_cache_path(filename)
+    if is_in_cache(filename) or not os.path.exists(from_path):
+        return False
     
-    if os.path.exists(from_path) and not os.path.exists(cache_path):
-        shutil.copy2(from_path, cache_path)
-        return True
+    cache_path = get_cache_path(filename)
+    if not os.path.exists(cache_path):
+        link_or_copy(from_path, cache_path)
+    mark_cached(filename)
     
-    return False
+    return True
 
 # ================= MODRINTH API FUNCTIONS =================
 
 def modrinth_search_mods(query, mc_version=None, loader=None, limit=10, offset=0):
-    """Search for mods on Modrinth with the given criteria."""
+    """Search for mods on Modrinth with the given criteria, returning None if the search failed."""
     facets = []
     if mc_version:
         facets.append(["versions:" + mc_version])
@@ -170,39 +563,24 @@ def modrinth_search_mods(query, mc_version=None, loader=None, limit=10, offset=0
     }
     
     if facets:
-        params["facets"] = json.dumps(facets)
-    
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Authorization": MODRINTH_API_KEY
-    }
+        params["facets"] = json_dumps(facets)
     
     try:
-        response = requests.get(f"{MODRINTH_API}/search", params=params, headers=headers)
-        response.raise_for_status()
-        results = response.json()
+        results = cached_get_json(f"{MODRINTH_API}/search", params=params)
         return results['hits']
     except requests.exceptions.RequestException as e:
         print_colored(f"Error searching for mods on Modrinth: {e}", Fore.RED, Style.BRIGHT)
-        return []
+        return None
 
 def modrinth_get_mod_details(mod_id):
     """Get detailed information about a specific mod from Modrinth."""
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Authorization": MODRINTH_API_KEY
-    }
-    
     try:
-        response = requests.get(f"{MODRINTH_API}/project/{mod_id}", headers=headers)
-        response.raise_for_status()
-        mod_data = response.json()
+        mod_data = dict(cached_get_json(f"{MODRINTH_API}/project/{mod_id}"))
         
         # Get mod versions
-        versions_response = requests.get(f"{MODRINTH_API}/project/{mod_id}/version", headers=headers)
-        versions_response.raise_for_status()
-        mod_data['version_data'] = versions_response.json()
-        mod_data['versions'] = [v['version_number'] for v in versions_response.json()]
+        version_data = cached_get_json(f"{MODRINTH_API}/project/{mod_id}/version")
+        mod_data['version_data'] = version_data
+        mod_data['versions'] = [v['version_number'] for v in version_data]
         
         return mod_data
     except requests.exceptions.RequestException as e:
@@ -211,15 +589,8 @@ def modrinth_get_mod_details(mod_id):
 
 def modrinth_list_mod_versions(mod_id, mc_version=None, loader=None):
     """List available versions for a mod with optional filtering from Modrinth."""
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Authorization": MODRINTH_API_KEY
-    }
-    
     try:
-        response = requests.get(f"{MODRINTH_API}/project/{mod_id}/version", headers=headers)
-        response.raise_for_status()
-        versions = response.json()
+        versions = cached_get_json(f"{MODRINTH_API}/project/{mod_id}/version")
         
         # Filter versions if needed
         if mc_version or loader:
@@ -233,28 +604,221 @@ def modrinth_list_mod_versions(mod_id, mc_version=None, loader=None):
                     filtered_versions.append(version)
             return filtered_versions
         
-        return versions
+        return list(versions)
     except requests.exceptions.RequestException as e:
         print_colored(f"Error listing mod versions from Modrinth: {e}", Fore.RED, Style.BRIGHT)
         return []
 
-def modrinth_download_file(url, filename, output_dir, force_download=False):
-    """Download a file from Modrinth with caching support."""
+def modrinth_get_version(version_id):
+    """Get a single Modrinth version by ID."""
+    try:
+        return cached_get_json(f"{MODRINTH_API}/version/{version_id}")
+    except requests.exceptions.RequestException as e:
+        print_colored(f"Error getting version {version_id} from Modrinth: {e}", Fore.RED, Style.BRIGHT)
+        return None
+
+def modrinth_get_versions(version_ids):
+    """Get several Modrinth versions by ID with a single request."""
+    if not version_ids:
+        return []
+    
+    try:
+        return cached_get_json(f"{MODRINTH_API}/versions", params={"ids": json_dumps(list(version_ids))})
+    except requests.exceptions.RequestException as e:
+        print_colored(f"Error getting versions from Modrinth: {e}", Fore.RED, Style.BRIGHT)
+        return []
+
+def download_once(download):
+    """Decorate a download function so concurrent calls for the same file and output directory share one download."""
+    @functools.wraps(download)
+    def wrapper(url, filename, output_dir, *args, **kwargs):
+        key = (filename, os.path.abspath(output_dir))
+        with DOWNLOADS_LOCK:
+            future = DOWNLOADS_IN_FLIGHT.get(key)
+            running = future is not None
+            if not running:
+                future = DOWNLOADS_IN_FLIGHT[key] = Future()
+        
+        if running:
+            return future.result()
+        
+        try:
+            result = download(url, filename, output_dir, *args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with DOWNLOADS_LOCK:
+                del DOWNLOADS_IN_FLIGHT[key]
+    
+    return wrapper
+
+def preallocate(fd, size):
+    """Reserve size bytes for an open file in one go where the platform supports it."""
+    if size > 0 and hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass  # Not supported by this filesystem
+
+def download_file_ranges(session, url, file_path, size, progress, headers=None):
+    """Download url into file_path as DOWNLOAD_WORKERS byte ranges fetched in parallel.
+    
+    Each range is written at its own offset; progress is called with the size of every block.
+    Servers can advertise range support and still answer a range request with the whole
+    file (e.g. on a CDN cache miss); then nothing is kept, the progress is taken back and
+    False is returned so the caller can fetch the file in one stream instead.
+    If any range fails, file_path is removed rather than left full size with holes.
+    """
+    part_size = -(-size // DOWNLOAD_WORKERS)
+    ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    
+    def fetch_range(start, end):
+        """Fetch one range, returning the number of bytes written or None if the server ignored the range."""
+        range_headers = dict(headers or {}, Range=f"bytes={start}-{end}")
+        with session.get(url, stream=True, headers=range_headers) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                return None
+            
+            offset = start
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                progress(len(chunk))
+        
+        if offset != end + 1:
+            raise requests.exceptions.RequestException(f"Range {start}-{end} of {url} ended early")
+        return offset - start
+    
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        preallocate(fd, size)
+        os.ftruncate(fd, size)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            written = [future.result() for future in [executor.submit(fetch_range, start, end) for start, end in ranges]]
+    except BaseException:
+        os.close(fd)
+        os.remove(file_path)
+        raise
+    os.close(fd)
+    
+    if None in written:
+        os.remove(file_path)
+        progress(-sum(count for count in written if count))
+        return False
+    return True
+
+@contextlib.contextmanager
+def download_progress(filename, size):
+    """Add a download of size bytes to the shared progress bar and yield its update callback.
+    
+    Downloads running at the same time report to one aggregate bar instead of stacking
+    a bar each; the bar is closed when the last of them finishes.
+    """
+    global PROGRESS_BAR, PROGRESS_USERS
+    with PROGRESS_LOCK:
+        PROGRESS_USERS += 1
+        if PROGRESS_BAR is None:
+            # Imported on first use so searches and --help do not pay for it
+            from tqdm import tqdm
+            PROGRESS_BAR = tqdm(total=size, unit='B', unit_scale=True, unit_divisor=1024, desc=filename, ncols=100)
+        else:
+            PROGRESS_BAR.total += size
+            PROGRESS_BAR.set_description(f"{PROGRESS_USERS} files", refresh=False)
+            PROGRESS_BAR.refresh()
+        bar = PROGRESS_BAR
+    
+    try:
+        yield bar.update
+    finally:
+        with PROGRESS_LOCK:
+            PROGRESS_USERS -= 1
+            if PROGRESS_USERS:
+                bar.set_description(f"{PROGRESS_USERS} files" if PROGRESS_USERS > 1 else "1 file", refresh=False)
+            else:
+                bar.close()
+                PROGRESS_BAR = None
+
+def save_stream(response, file_path, size, progress):
+    """Write the body of a streamed response to file_path and return its SHA1 hex digest.
+    
+    A partial file_path is removed if the transfer fails.
+    """
+    sha1 = hashlib.sha1()
     try:
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Authorization": MODRINTH_API_KEY
-        }
+        with open(file_path, 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+            preallocate(f.fileno(), size)
+            # Copy the raw socket stream straight to disk, hashing and reporting progress as it is read
+            response.raw.decode_content = True
+            shutil.copyfileobj(HashingReader(response.raw, sha1, progress), f, DOWNLOAD_CHUNK_SIZE)
+            # Drop any preallocated space the body did not fill (e.g. a compressed Content-Length)
+            f.truncate()
+    except BaseException:
+        # A broken connection, timeout or full disk must not leave a partial file behind
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    return sha1.hexdigest()
+
+def stream_file(session, url, file_path, filename, headers=None, expected_sha1=None):
+    """Stream url into file_path, reporting to the shared progress bar.
+    
+    Large files are split into parallel range requests when the server allows it.
+    The body is written to a temporary file next to file_path that only replaces it
+    once it is complete and, when expected_sha1 is given, matches it, and that is
+    removed if the download fails. An existing file_path, which may be a hard link
+    to the cache, is therefore never rewritten or left partial.
+    Returns False on a checksum mismatch, True otherwise.
+    """
+    part_path = file_path + ".part"
+    # Closing the response on the way out returns its connection to the pool even when a write fails
+    with session.get(url, stream=True, headers=headers) as response:
+        response.raise_for_status()
+        
+        total_size = int(response.headers.get('content-length', 0))
         
+        with download_progress(filename, total_size) as progress:
+            if total_size >= RANGE_DOWNLOAD_MIN_SIZE and hasattr(os, 'pwrite') and \
+               response.headers.get('Accept-Ranges') == 'bytes' and not response.headers.get('Content-Encoding'):
+                # Ask for the ranges at the final (redirected) URL
+                response.close()
+                if download_file_ranges(session, response.url, part_path, total_size, progress, headers):
+                    digest = file_sha1(part_path) if expected_sha1 else None
+                else:
+                    # The ranges came back whole, so fetch the file in one stream after all
+                    with session.get(response.url, stream=True, headers=headers) as retry:
+                        retry.raise_for_status()
+                        digest = save_stream(retry, part_path, total_size, progress)
+            else:
+                digest = save_stream(response, part_path, total_size, progress)
+    
+    if expected_sha1 and digest != expected_sha1.lower():
+        os.remove(part_path)
+        return False
+    
+    os.replace(part_path, file_path)
+    return True
+
+@download_once
+def modrinth_download_file(url, filename, output_dir, force_download=False, expected_sha1=None):
+    """Download a file from Modrinth with caching support.
+    
+    When expected_sha1 is given, cached and downloaded copies are checked against it.
+    """
+    try:
         # Check if the file is in cache and we're not forcing a download
         if not force_download and is_in_cache(filename):
             print_colored(f"Using cached version of {filename}...", Fore.YELLOW)
-            if copy_from_cache(filename, output_dir):
+            if copy_from_cache(filename, output_dir, expected_sha1):
                 return True
         
         # Check if the file already exists in the output directory
         file_path = os.path.join(output_dir, filename)
-        if os.path.exists(file_path) and not force_download:
+        if os.path.exists(file_path) and not force_download and \
+           (not expected_sha1 or file_sha1(file_path) == expected_sha1.lower()):
             print_colored(f"File {filename} already exists in output directory, skipping...", Fore.YELLOW)
             # Still save to cache if it's not there
             save_to_cache(filename, file_path)
@@ -262,19 +826,9 @@ def modrinth_download_file(url, filename, output_dir, force_download=False):
         
         print_colored(f"Downloading {filename} from Modrinth...", Fore.CYAN)
         
-        response = requests.get(url, stream=True, headers=headers)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        
-        with open(file_path, 'wb') as f, tqdm(
-            total=total_size, unit='B', unit_scale=True, unit_divisor=1024,
-            desc=filename, ncols=100
-        ) as pbar:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    pbar.update(len(chunk))
+        if not stream_file(DOWNLOAD_SESSION, url, file_path, filename, expected_sha1=expected_sha1):
+            print_colored(f"Checksum mismatch for {filename}, discarding it", Fore.RED, Style.BRIGHT)
+            return False
         
         # Save to cache
         save_to_cache(filename, file_path)
@@ -288,6 +842,39 @@ def modrinth_download_file(url, filename, output_dir, force_download=False):
         print_colored(f"Error: {e}", Fore.RED, Style.BRIGHT)
         return False
 
+def modrinth_download_dependency(dependency, mc_version, loader, output_dir, force_download=False, dep_version=None):
+    """Resolve a required Modrinth dependency to its file and download it.
+    
+    dep_version is the pinned version when it has already been fetched.
+    """
+    dep_project_id = dependency.get('project_id')
+    dep_version_id = dependency.get('version_id')
+    print_colored(f"Resolving dependency: {dep_project_id}", Fore.CYAN)
+    
+    if not dep_version and dep_version_id:
+        # Get the version details
+        dep_version = modrinth_get_version(dep_version_id)
+    elif not dep_version:
+        # Find latest compatible version
+        dep_versions = modrinth_list_mod_versions(dep_project_id, mc_version, loader)
+        if dep_versions:
+            # Use the first version (should be latest)
+            dep_version = dep_versions[0]
+    
+    if not dep_version:
+        return False
+    
+    # Download the file
+    dep_files = dep_version.get('files', [])
+    if not dep_files:
+        return False
+    
+    dep_primary_files = [f for f in dep_files if f.get('primary', False)]
+    dep_file_info = dep_primary_files[0] if dep_primary_files else dep_files[0]
+    
+    return modrinth_download_file(dep_file_info['url'], dep_file_info['filename'], output_dir, force_download,
+                                  dep_file_info.get('hashes', {}).get('sha1'))
+
 def modrinth_download_mod(mod_id, mc_version=None, loader=None, output_dir=".", specific_version=None, force_download=False):
     """Download a mod from Modrinth with optional version specification and dependency resolution."""
     # Ensure output directory exists
@@ -334,56 +921,24 @@ def modrinth_download_mod(mod_id, mc_version=None, loader=None, output_dir=".",
     filename = file_info['filename']
     url = file_info['url']
     
-    success = modrinth_download_file(url, filename, output_dir, force_download)
+    success = modrinth_download_file(url, filename, output_dir, force_download, file_info.get('hashes', {}).get('sha1'))
     
-    # Process dependencies
+    # Process dependencies, downloading them all at once
     if success and 'dependencies' in version:
         print_colored(f"Processing dependencies for {version['name']} from Modrinth...", Fore.CYAN)
-        for dependency in version['dependencies']:
-            if dependency.get('dependency_type') == 'required':
-                dep_project_id = dependency.get('project_id')
-                dep_version_id = dependency.get('version_id')
-                
-                if dep_project_id:
-                    print_colored(f"Resolving dependency: {dependency.get('project_id')}", Fore.CYAN)
-                    
-                    if dep_version_id:
-                        # Get the version details
-                        dep_version = None
-                        dep_versions = modrinth_list_mod_versions(dep_project_id)
-                        for v in dep_versions:
-                            if v.get('id') == dep_version_id:
-                                dep_version = v
-                                break
-                        
-                        if dep_version:
-                            # Download the file
-                            dep_files = dep_version.get('files', [])
-                            if dep_files:
-                                dep_primary_files = [f for f in dep_files if f.get('primary', False)]
-                                dep_file_info = dep_primary_files[0] if dep_primary_files else dep_files[0]
-                                
-                                dep_filename = dep_file_info['filename']
-                                dep_url = dep_file_info['url']
-                                
-                                modrinth_download_file(dep_url, dep_filename, output_dir, force_download)
-                    else:
-                        # Find latest compatible version
-                        dep_versions = modrinth_list_mod_versions(dep_project_id, mc_version, loader)
-                        if dep_versions:
-                            # Use the first version (should be latest)
-                            dep_version = dep_versions[0]
-                            
-                            # Download the file
-                            dep_files = dep_version.get('files', [])
-                            if dep_files:
-                                dep_primary_files = [f for f in dep_files if f.get('primary', False)]
-                                dep_file_info = dep_primary_files[0] if dep_primary_files else dep_files[0]
-                                
-                                dep_filename = dep_file_info['filename']
-                                dep_url = dep_file_info['url']
-                                
-                                modrinth_download_file(dep_url, dep_filename, output_dir, force_download)
+        # Keyed by project so a project listed twice is only resolved once
+        required = list({
+            dependency['project_id']: dependency for dependency in version['dependencies']
+            if dependency.get('dependency_type') == 'required' and dependency.get('project_id')
+        }.values())
+        # Fetch every pinned dependency version in one request
+        pinned = {v['id']: v for v in modrinth_get_versions(
+            [dependency['version_id'] for dependency in required if dependency.get('version_id')]
+        )}
+        run_concurrently(modrinth_download_dependency, [
+            (dependency, mc_version, loader, output_dir, force_download, pinned.get(dependency.get('version_id')))
+            for dependency in required
+        ])
     
     return success
 
@@ -391,42 +946,28 @@ def modrinth_download_mod(mod_id, mc_version=None, loader=None, output_dir=".",
 
 def curseforge_make_api_request(endpoint, method="GET", params=None, data=None):
     """Make an API request to CurseForge API."""
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "application/json",
-        "x-api-key": CURSEFORGE_API_KEY
-    }
-    
     url = f"{CURSEFORGE_API}{endpoint}"
     
     try:
         if method == "GET":
-            response = requests.get(url, headers=headers, params=params)
+            return cached_get_json(url, CURSEFORGE_SESSION, params=params)
         elif method == "POST":
-            headers["Content-Type"] = "application/json"
-            response = requests.post(url, headers=headers, json=data)
+            response = CURSEFORGE_SESSION.post(url, json=data)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
         
         response.raise_for_status()
-        return response.json()
+        return response_json(response)
     except requests.exceptions.RequestException as e:
         print_colored(f"CurseForge API request error ({url}): {e}", Fore.RED, Style.BRIGHT)
         return None
 
 def curseforge_search_mods(query, mc_version=None, loader=None, limit=10, offset=0):
-    """Search for mods on CurseForge with the given criteria."""
+    """Search for mods on CurseForge with the given criteria, returning None if the search failed."""
     # Get modloader ID if provided
     modloader_id = None
     if loader:
-        loader_map = {
-            "forge": 1,
-            "cauldron": 2,
-            "liteloader": 3,
-            "fabric": 4,
-            "quilt": 5
-        }
-        modloader_id = loader_map.get(loader.lower())
+        modloader_id = CURSEFORGE_LOADER_IDS.get(loader.lower())
     
     # Prepare search data
     search_data = {
@@ -450,19 +991,21 @@ def curseforge_search_mods(query, mc_version=None, loader=None, limit=10, offset
     
     if response and 'data' in response:
         return response['data']
-    return []
+    return None
 
 def curseforge_get_mod_details(mod_id):
     """Get detailed information about a specific mod from CurseForge."""
     response = curseforge_make_api_request(f"/v1/mods/{mod_id}")
     
     if response and 'data' in response:
+        mod_data = dict(response['data'])
+        
         # Get mod files
         files_response = curseforge_make_api_request(f"/v1/mods/{mod_id}/files")
         if files_response and 'data' in files_response:
-            response['data']['latestFiles'] = files_response['data']
+            mod_data['latestFiles'] = files_response['data']
         
-        return response['data']
+        return mod_data
     return None
 
 def curseforge_get_mod_files(mod_id, mc_version=None, loader=None):
@@ -473,14 +1016,7 @@ def curseforge_get_mod_files(mod_id, mc_version=None, loader=None):
         params["gameVersion"] = mc_version
     
     if loader:
-        loader_map = {
-            "forge": 1,
-            "cauldron": 2,
-            "liteloader": 3,
-            "fabric": 4,
-            "quilt": 5
-        }
-        modloader_id = loader_map.get(loader.lower())
+        modloader_id = CURSEFORGE_LOADER_IDS.get(loader.lower())
         if modloader_id:
             params["modLoaderType"] = modloader_id
     
@@ -490,24 +1026,23 @@ def curseforge_get_mod_files(mod_id, mc_version=None, loader=None):
         return response['data']
     return []
 
-def curseforge_download_file(url, filename, output_dir, force_download=False):
-    """Download a file from CurseForge with caching support."""
+@download_once
+def curseforge_download_file(url, filename, output_dir, force_download=False, expected_sha1=None):
+    """Download a file from CurseForge with caching support.
+    
+    When expected_sha1 is given, cached and downloaded copies are checked against it.
+    """
     try:
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Accept": "application/octet-stream",
-            "x-api-key": CURSEFORGE_API_KEY
-        }
-        
         # Check if the file is in cache and we're not forcing a download
         if not force_download and is_in_cache(filename):
             print_colored(f"Using cached version of {filename}...", Fore.YELLOW)
-            if copy_from_cache(filename, output_dir):
+            if copy_from_cache(filename, output_dir, expected_sha1):
                 return True
         
         # Check if the file already exists in the output directory
         file_path = os.path.join(output_dir, filename)
-        if os.path.exists(file_path) and not force_download:
+        if os.path.exists(file_path) and not force_download and \
+           (not expected_sha1 or file_sha1(file_path) == expected_sha1.lower()):
             print_colored(f"File {filename} already exists in output directory, skipping...", Fore.YELLOW)
             # Still save to cache if it's not there
             save_to_cache(filename, file_path)
@@ -515,19 +1050,9 @@ def curseforge_download_file(url, filename, output_dir, force_download=False):
         
         print_colored(f"Downloading {filename} from CurseForge...", Fore.CYAN)
         
-        response = requests.get(url, stream=True, headers=headers)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        
-        with open(file_path, 'wb') as f, tqdm(
-            total=total_size, unit='B', unit_scale=True, unit_divisor=1024,
-            desc=filename, ncols=100
-        ) as pbar:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    pbar.update(len(chunk))
+        if not stream_file(DOWNLOAD_SESSION, url, file_path, filename, CURSEFORGE_DOWNLOAD_HEADERS, expected_sha1):
+            print_colored(f"Checksum mismatch for {filename}, discarding it", Fore.RED, Style.BRIGHT)
+            return False
         
         # Save to cache
         save_to_cache(filename, file_path)
@@ -541,74 +1066,126 @@ def curseforge_download_file(url, filename, output_dir, force_download=False):
         print_colored(f"Error: {e}", Fore.RED, Style.BRIGHT)
         return False
 
-def curseforge_process_dependencies(mod_id, file_id, output_dir, force_download=False):
-    """Process and download dependencies for a mod file from CurseForge."""
-    file_data = curseforge_make_api_request(f"/v1/mods/{mod_id}/files/{file_id}")
-    if not file_data or 'data' not in file_data:
+def curseforge_get_mods(mod_ids):
+    """Get details for several CurseForge mods with a single request."""
+    if not mod_ids:
+        return []
+    
+    response = curseforge_make_api_request("/v1/mods", method="POST", data={"modIds": list(mod_ids)})
+    
+    if response and 'data' in response:
+        return response['data']
+    return []
+
+def curseforge_get_files(file_ids):
+    """Get several CurseForge files by ID with a single request."""
+    if not file_ids:
+        return []
+    
+    response = curseforge_make_api_request("/v1/mods/files", method="POST", data={"fileIds": list(file_ids)})
+    
+    if response and 'data' in response:
+        return response['data']
+    return []
+
+def curseforge_newest_compatible_file(dep_mod, game_versions):
+    """Find the newest file of a dependency mod matching any of game_versions.
+    
+    The mod's latestFilesIndexes are checked first; the full file list is only
+    fetched when none of them match. Returns the file ID, or None.
+    """
+    indexed = [
+        file_index['fileId'] for file_index in dep_mod.get('latestFilesIndexes', [])
+        if file_index.get('gameVersion') in game_versions
+    ]
+    if indexed:
+        # File IDs grow over time, so the highest one is the newest
+        return max(indexed)
+    
+    dep_files = curseforge_get_mod_files(dep_mod.get('id'))
+    
+    # Filter files by game version
+    compatible_files = []
+    for dep_file in dep_files:
+        dep_game_versions = dep_file.get('gameVersions', [])
+        # Check if any game version matches
+        if any(version in dep_game_versions for version in game_versions):
+            compatible_files.append(dep_file)
+    
+    if not compatible_files:
+        return None
+    
+    # Use the newest compatible file
+    return max(compatible_files, key=lambda f: f.get('fileDate', '')).get('id')
+
+def curseforge_download_dependency(dep_file, output_dir, force_download=False):
+    """Download a resolved CurseForge dependency file."""
+    dep_mod_id = dep_file.get('modId')
+    
+    # Download the dependency
+    dep_url = dep_file.get('downloadUrl')
+    if not dep_url:
+        print_colored(f"No download URL found for dependency {dep_file.get('displayName', dep_mod_id)}", Fore.RED)
         return False
     
-    file_data = file_data['data']
-    dependencies = file_data.get('dependencies', [])
-    if not dependencies:
-        return True
+    dep_filename = dep_file.get('fileName', f"mod_{dep_mod_id}_{dep_file.get('id')}.jar")
     
-    print_colored(f"Processing dependencies for {file_data.get('fileName', 'Unknown')} from CurseForge...", Fore.CYAN)
+    return curseforge_download_file(dep_url, dep_filename, output_dir, force_download, curseforge_file_sha1(dep_file))
+
+def curseforge_download_dependencies(mod_id, file_data, output_dir, force_download=False):
+    """Download the required dependencies of a CurseForge file and, transitively, theirs.
     
-    for dependency in dependencies:
-        if dependency.get('relationType') == 3:  # Required dependency
-            dep_mod_id = dependency.get('modId')
+    The dependency graph is walked breadth-first, one level at a time, with each level
+    resolved by one bulk mods request and one bulk files request. Every mod is visited
+    at most once, so shared dependencies are fetched once and cycles terminate.
+    """
+    seen = {mod_id}
+    level = [file_data]
+    while level:
+        required = []
+        for parent in level:
+            new_mod_ids = {
+                dependency.get('modId') for dependency in parent.get('dependencies', [])
+                if dependency.get('relationType') == 3 and dependency.get('modId')  # Required dependency
+            } - seen
+            if new_mod_ids:
+                print_colored(f"Processing dependencies for {parent.get('fileName', 'Unknown')} from CurseForge...", Fore.CYAN)
+                seen.update(new_mod_ids)
+                required.extend((dep_mod_id, parent) for dep_mod_id in sorted(new_mod_ids))
+        if not required:
+            return
+        
+        dep_mods = {dep_mod.get('id'): dep_mod for dep_mod in curseforge_get_mods([dep_mod_id for dep_mod_id, _ in required])}
+        
+        file_ids = []
+        for dep_mod_id, parent in required:
+            dep_mod = dep_mods.get(dep_mod_id)
+            if not dep_mod:
+                print_colored(f"Could not find dependency mod ID {dep_mod_id}", Fore.RED)
+                continue
             
-            if dep_mod_id:
-                print_colored(f"Resolving dependency: Mod ID {dep_mod_id}", Fore.CYAN)
-                
-                # Get the mod details
-                dep_mod = curseforge_get_mod_details(dep_mod_id)
-                if not dep_mod:
-                    print_colored(f"Could not find dependency mod ID {dep_mod_id}", Fore.RED)
-                    continue
-                
-                print_colored(f"Found dependency: {dep_mod.get('name', 'Unknown')}", Fore.GREEN)
-                
-                # Get compatible files
-                dep_files = curseforge_get_mod_files(dep_mod_id)
-                if not dep_files:
-                    print_colored(f"No files found for dependency {dep_mod.get('name', 'Unknown')}", Fore.RED)
-                    continue
-                
-                # Filter files by game version
-                game_versions = file_data.get('gameVersions', [])
-                
-                compatible_files = []
-                for dep_file in dep_files:
-                    dep_game_versions = dep_file.get('gameVersions', [])
-                    # Check if any game version matches
-                    if any(version in dep_game_versions for version in game_versions):
-                        compatible_files.append(dep_file)
-                
-                if not compatible_files:
-                    print_colored(f"No compatible files found for dependency {dep_mod.get('name', 'Unknown')}", Fore.RED)
-                    continue
-                
-                # Sort by date (newest first)
-                compatible_files.sort(key=lambda f: f.get('fileDate', ''), reverse=True)
-                
-                # Use the newest compatible file
-                dep_file = compatible_files[0]
-                
-                # Download the dependency
-                dep_url = dep_file.get('downloadUrl')
-                if not dep_url:
-                    print_colored(f"No download URL found for dependency {dep_mod.get('name', 'Unknown')}", Fore.RED)
-                    continue
-                
-                dep_filename = dep_file.get('fileName', f"mod_{dep_mod_id}_{dep_file.get('id')}.jar")
-                
-                success = curseforge_download_file(dep_url, dep_filename, output_dir, force_download)
-                
-                if success:
-                    # Recursively process its dependencies
-                    curseforge_process_dependencies(dep_mod_id, dep_file.get('id'), output_dir, force_download)
+            print_colored(f"Found dependency: {dep_mod.get('name', 'Unknown')}", Fore.GREEN)
+            
+            dep_file_id = curseforge_newest_compatible_file(dep_mod, parent.get('gameVersions', []))
+            if dep_file_id:
+                file_ids.append(dep_file_id)
+            else:
+                print_colored(f"No compatible files found for dependency {dep_mod.get('name', 'Unknown')}", Fore.RED)
+        
+        # Download the whole level at once, then move on to its dependencies
+        dep_files = curseforge_get_files(file_ids)
+        downloaded = run_concurrently(curseforge_download_dependency, [
+            (dep_file, output_dir, force_download) for dep_file in dep_files
+        ])
+        level = [dep_file for dep_file, success in zip(dep_files, downloaded) if success]
+
+def curseforge_process_dependencies(mod_id, file_id, output_dir, force_download=False):
+    """Process and download dependencies for a mod file from CurseForge."""
+    file_data = curseforge_make_api_request(f"/v1/mods/{mod_id}/files/{file_id}")
+    if not file_data or 'data' not in file_data:
+        return False
     
+    curseforge_download_dependencies(mod_id, file_data['data'], output_dir, force_download)
     return True
 
 def curseforge_download_mod(mod_id, mc_version=None, loader=None, output_dir=".", specific_file_id=None, force_download=False):
@@ -635,7 +1212,8 @@ def curseforge_download_mod(mod_id, mc_version=None, loader=None, output_dir="."
         # Download the file
         filename = file_data.get('fileName', f"mod_{mod_id}_{specific_file_id}.jar")
         
-        success = curseforge_download_file(download_url, filename, output_dir, force_download)
+        success = curseforge_download_file(download_url, filename, output_dir, force_download,
+                                           curseforge_file_sha1(file_data))
         
         # Process dependencies
         if success:
@@ -643,9 +1221,9 @@ def curseforge_download_mod(mod_id, mc_version=None, loader=None, output_dir="."
         
         return success
     
-    # Get mod details
-    mod_data = curseforge_get_mod_details(mod_id)
-    if not mod_data:
+    # Check the mod exists; its files are fetched below, so skip the file list in the details
+    mod_data = curseforge_make_api_request(f"/v1/mods/{mod_id}")
+    if not mod_data or 'data' not in mod_data:
         print_colored(f"Could not find mod with ID: {mod_id} on CurseForge", Fore.RED, Style.BRIGHT)
         return False
     
@@ -656,7 +1234,7 @@ def curseforge_download_mod(mod_id, mc_version=None, loader=None, output_dir="."
         return False
     
     # Sort files by date (newest first)
-    files.sort(key=lambda f: f.get('fileDate', ''), reverse=True)
+    files = sorted(files, key=lambda f: f.get('fileDate', ''), reverse=True)
     
     # Use the newest file
     file = files[0]
@@ -671,7 +1249,7 @@ def curseforge_download_mod(mod_id, mc_version=None, loader=None, output_dir="."
     # Download the file
     filename = file.get('fileName', f"mod_{mod_id}_{file_id}.jar")
     
-    success = curseforge_download_file(download_url, filename, output_dir, force_download)
+    success = curseforge_download_file(download_url, filename, output_dir, force_download, curseforge_file_sha1(file))
     
     # Process dependencies
     if success:
@@ -681,8 +1259,34 @@ def curseforge_download_mod(mod_id, mc_version=None, loader=None, output_dir="."
 
 # ================= COMBINED FUNCTIONS =================
 
+def prime_download_connection(source):
+    """Open a connection to the download host of source in the background.
+    
+    The TCP and TLS handshakes then overlap with the API lookups that come before the
+    first file download, which finds a live connection in DOWNLOAD_SESSION's pool.
+    Each host is only primed once per run.
+    """
+    url = DOWNLOAD_HOSTS.get(source)
+    if not url:
+        return
+    # Called from the download thread pool, so check and record the host in one step
+    with PRIMED_HOSTS_LOCK:
+        if url in PRIMED_HOSTS:
+            return
+        PRIMED_HOSTS.add(url)
+    
+    def prime():
+        try:
+            DOWNLOAD_SESSION.head(url, timeout=10).close()
+        except requests.exceptions.RequestException:
+            pass  # Only a warm-up; the download itself reports failures
+    
+    threading.Thread(target=prime, daemon=True).start()
+
 def download_mod(mod_id, source="modrinth", mc_version=None, loader=None, output_dir=".", specific_version=None, force_download=False):
     """Download a mod from the specified source."""
+    prime_download_connection(source)
+    
     if source == "modrinth":
         return modrinth_download_mod(mod_id, mc_version, loader, output_dir, specific_version, force_download)
     elif source == "curseforge":
@@ -691,24 +1295,143 @@ def download_mod(mod_id, source="modrinth", mc_version=None, loader=None, output
         print_colored(f"Unknown source: {source}", Fore.RED, Style.BRIGHT)
         return False
 
-def search_mods(query, source="both", mc_version=None, loader=None, limit=10):
-    """Search for mods across both platforms."""
-    results = []
+def search_platforms(query, source="both", mc_version=None, loader=None, limit=10):
+    """Search for mods like search_mods, also returning the platforms whose search failed.
     
+    Returns a (results, failed) pair, where failed lists the sources that could not be searched.
+    """
+    searches = []
     if source == "both" or source == "modrinth":
-        modrinth_results = modrinth_search_mods(query, mc_version, loader, limit)
-        for mod in modrinth_results:
-            results.append({"source": "modrinth", "data": mod})
-    
+        searches.append(("modrinth", modrinth_search_mods, ModRecord.from_modrinth))
     if source == "both" or source == "curseforge":
-        curseforge_results = curseforge_search_mods(query, mc_version, loader, limit)
-        for mod in curseforge_results:
-            results.append({"source": "curseforge", "data": mod})
+        searches.append(("curseforge", curseforge_search_mods, ModRecord.from_curseforge))
+    
+    # Query both platforms at the same time
+    found = run_concurrently(
+        lambda search: search(query, mc_version, loader, limit),
+        [(search,) for _, search, _ in searches]
+    )
+    
+    results = []
+    failed = []
+    for (platform, _, make_record), mods in zip(searches, found):
+        if mods is None:
+            failed.append(platform)
+            continue
+        for mod in mods:
+            results.append(make_record(mod))
     
     # Sort by popularity (downloads)
-    results.sort(key=lambda r: r["data"].get("downloads", 0) if r["source"] == "modrinth" else r["data"].get("downloadCount", 0), reverse=True)
+    results.sort(key=operator.attrgetter("downloads"), reverse=True)
     
-    return results[:limit]
+    return results[:limit], failed
+
+def search_mods(query, source="both", mc_version=None, loader=None, limit=10):
+    """Search for mods across both platforms and return them as ModRecords, most downloaded first."""
+    return search_platforms(query, source, mc_version, loader, limit)[0]
+
+def prune_search_cache(cache_dir):
+    """Delete the search cache entries that are older than SEARCH_CACHE_TTL."""
+    expired = time.time() - SEARCH_CACHE_TTL
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < expired:
+                        os.remove(entry.path)
+                except OSError:
+                    pass  # Removed by another run, or not ours to remove
+    except FileNotFoundError:
+        pass
+
+def cached_search_mods(query, source="both", mc_version=None, loader=None, limit=10):
+    """Search for mods like search_mods, reusing the results of the same search made within SEARCH_CACHE_TTL."""
+    key = json.dumps([query, source, mc_version, loader, limit])
+    cache_path = os.path.join(CACHE_DIR, "search_cache", hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json.gz")
+    
+    try:
+        if time.time() - os.path.getmtime(cache_path) < SEARCH_CACHE_TTL:
+            return [ModRecord(*fields) for fields in read_gzip_json(cache_path)]
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # Missing, expired or unreadable
+    
+    results, failed = search_platforms(query, source, mc_version, loader, limit)
+    
+    # Results missing a platform that could not be reached are not kept, so the next search asks it again
+    if not failed:
+        try:
+            prune_search_cache(os.path.dirname(cache_path))
+            write_gzip_json(cache_path, [[getattr(result, field) for field in ModRecord.__slots__] for result in results])
+        except OSError as e:
+            print_colored(f"Could not cache search results for '{query}': {e}", Fore.YELLOW)
+    
+    return results
+
+def search_and_download(query, source="both", mc_version=None, loader=None, limit=10, output_dir=".",
+                        specific_version=None, force_download=False, download=True, use_cache=True,
+                        verbose=False, quiet=False):
+    """Search for mods, show the results and optionally download each of them.
+    
+    Search results are reused from the search cache unless use_cache is False.
+    When downloading, the full result listing is only shown if verbose is set, and
+    quiet drops the per-mod start/finish lines in favour of a final count.
+    Returns False if any of the requested downloads failed.
+    """
+    if use_cache:
+        results = cached_search_mods(query, source, mc_version, loader, limit)
+    else:
+        results = search_mods(query, source, mc_version, loader, limit)
+    
+    if not results:
+        print_colored(f"No results found for '{query}'", Fore.YELLOW)
+        return True
+    
+    print_colored(f"Found {len(results)} results for '{query}'" + (":" if not download or verbose else ""), Fore.GREEN, Style.BRIGHT)
+    if not download or verbose:
+        # Show every result with one write before any download output starts
+        sys.stdout.write("".join(format_mod_info(result) for result in results))
+    
+    if not download:
+        return True
+    
+    # main() checks this before searching; callers importing this module may not have
+    if not mc_version or not loader:
+        print_colored("MC version and loader are required for downloads", Fore.RED)
+        return False
+    
+    def download_result(result):
+        if not quiet:
+            print_colored(f"Downloading {result.mod_id} from {result.source}...", Fore.CYAN)
+        success = download_mod(result.mod_id, result.source, mc_version, loader, output_dir, specific_version, force_download)
+        if not success:
+            print_colored(f"Failed to download {result.title} ({result.mod_id})", Fore.RED)
+        elif not quiet:
+            print_colored(f"Finished {result.title} ({result.mod_id})", Fore.GREEN)
+        return success
+    
+    # A project published on both platforms usually keeps its slug, so download it
+    # once, from whichever listing ranked higher
+    jobs = []
+    seen = set()
+    for result in results:
+        keys = {(result.source, result.mod_id)}
+        if result.slug and result.slug != 'unknown':
+            keys.add(result.slug.lower())
+        if keys & seen:
+            if not quiet:
+                print_colored(f"Skipping {result.title} from {result.source}, already downloading it", Fore.YELLOW)
+            continue
+        seen |= keys
+        jobs.append((result,))
+    
+    # Download DOWNLOAD_WORKERS of the results at a time
+    downloaded = run_concurrently(download_result, jobs)
+    
+    if quiet:
+        count = sum(1 for success in downloaded if success)
+        print_colored(f"Downloaded {count} of {len(jobs)} mods", Fore.GREEN if count == len(jobs) else Fore.YELLOW, Style.BRIGHT)
+    
+    return all(downloaded)
 
 # ================= COMMAND LINE INTERFACE =================
 
@@ -726,12 +1449,16 @@ def main():
     parser.add_argument("--output", default=".", help="Output directory for downloads (default: current directory)")
     parser.add_argument("--force-download", action="store_true", help="Force download even if the file is in cache")
     parser.add_argument("--cache-dir", help="Custom cache directory (default: mod_cache in the script directory)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Search the platforms again instead of reusing results from the last {SEARCH_CACHE_TTL // 3600} hours")
+    parser.add_argument("--concurrency", type=int, default=DOWNLOAD_WORKERS, help=f"Number of downloads to run at the same time (default: {DOWNLOAD_WORKERS})")
+    parser.add_argument("--verbose", action="store_true", help="Show the full details of every search result when downloading them")
+    parser.add_argument("--quiet", action="store_true", help="Only report failures and a final count when downloading search results")
     
     args = parser.parse_args()
     
     # Set custom cache directory if provided
-    global CACHE_DIR
-    CACHE_DIR = args.cache_dir if args.cache_dir else DEFAULT_CACHE_DIR
+    set_cache_dir(args.cache_dir)
+    set_download_workers(args.concurrency)
     
     # Download a specific mod by ID
     if args.download_id:
@@ -758,34 +1485,27 @@ def main():
     
     # Search for mods
     if args.search:
-        results = search_mods(args.search, args.source, args.mc_version, args.loader, args.limit)
+        # Check this before searching, rather than after the results are in
+        if args.download and (not args.mc_version or not args.loader):
+            print_colored("MC version and loader are required for downloads (--mc-version and --loader)", Fore.RED, Style.BRIGHT)
+            sys.exit(1)
         
-        if results:
-            print_colored(f"Found {len(results)} results for '{args.search}':", Fore.GREEN, Style.BRIGHT)
-            for result in results:
-                print_mod_info(result["data"], result["source"])
-                
-                # Download the mod if requested
-                if args.download:
-                    mod_id = result["data"].get("id", result["data"].get("slug", ""))
-                    
-                    if not args.mc_version or not args.loader:
-                        print_colored("MC version and loader are required for downloads", Fore.RED)
-                        continue
-                    
-                    print_colored(f"Downloading {mod_id} from {result['source']}...", Fore.CYAN)
-                    download_mod(
-                        mod_id, 
-                        result["source"], 
-                        args.mc_version, 
-                        args.loader, 
-                        args.output, 
-                        args.version, 
-                        args.force_download
-                    )
-        else:
-            print_colored(f"No results found for '{args.search}'", Fore.YELLOW)
-        sys.exit(0)
+        success = search_and_download(
+            args.search, 
+            args.source, 
+            args.mc_version, 
+            args.loader, 
+            args.limit, 
+            args.output, 
+            args.version, 
+            args.force_download, 
+            download=args.download,
+            use_cache=not args.no_cache,
+            verbose=args.verbose,
+            quiet=args.quiet
+        )
+        # Let scripts calling this see when any of the downloads failed
+        sys.exit(0 if success else 1)
     
     # Show help if no options provided
     if not args.search and not args.download_id: